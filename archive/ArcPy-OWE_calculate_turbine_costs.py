@@ -17,30 +17,31 @@ Functions:
         Determines the support structure type based on water depth.
 
         Parameters:
-        - water_depth (float): Water depth in meters.
+        - water_depth (numpy.ndarray): Water depth in meters.
 
         Returns:
-        - str: Support structure type ('monopile', 'jacket', 'floating', or 'default').
+        - numpy.ndarray: Support structure type ('monopile', 'jacket', 'floating', or 'default').
 
-    calc_equip_costs(water_depth, year, turbine_capacity):
-        Calculates the equipment costs based on water depth values, year, and turbine capacity.
+    calc_equip_costs(support_structure, water_depth, year, turbine_capacity):
+        Calculates the equipment costs based on support structure, water depth values, year, and turbine capacity.
 
         Parameters:
-        - water_depth (float): Water depth in meters.
+        - support_structure (numpy.ndarray): Support structure type as returned by determine_support_structure.
+        - water_depth (numpy.ndarray): Water depth in meters.
         - year (str): Year for which equipment costs are calculated ('2020', '2030', or '2050').
-        - turbine_capacity (float): Rated power capacity of the wind turbine.
+        - turbine_capacity (numpy.ndarray): Rated power capacity of the wind turbine.
 
         Returns:
-        - float: Calculated equipment costs.
+        - numpy.ndarray: Calculated equipment costs.
 
-    calc_costs(water_depth, port_distance, turbine_capacity, operation):
-        Calculate installation or decommissioning costs based on the water depth, port distance,
+    calc_costs(support_structure, port_distance, turbine_capacity, operation):
+        Calculate installation or decommissioning costs based on the support structure, port distance,
         and rated power of the wind turbines.
 
         Parameters:
-        - water_depth (float): Water depth in meters.
-        - port_distance (float): Distance to the port in meters.
-        - turbine_capacity (float): Rated power capacity of the wind turbines in megawatts (MW).
+        - support_structure (numpy.ndarray): Support structure type as returned by determine_support_structure.
+        - port_distance (numpy.ndarray): Distance to the port in meters.
+        - turbine_capacity (numpy.ndarray): Rated power capacity of the wind turbines in megawatts (MW).
         - operation (str): Operation type ('installation' or 'decommissioning').
 
         Coefficients:
@@ -62,12 +63,12 @@ Functions:
         Returns:
         - tuple: Calculated hours and costs in Euros.
 
-    logi_costs(water_depth, port_distance, failure_rate=0.08):
-        Calculate logistics time and costs based on water depth, port distance, and failure rate for major wind turbine repairs.
+    logi_costs(support_structure, port_distance, failure_rate=0.08):
+        Calculate logistics time and costs based on support structure, port distance, and failure rate for major wind turbine repairs.
 
         Parameters:
-        - water_depth (float): Water depth in meters.
-        - port_distance (float): Distance to the port in meters.
+        - support_structure (numpy.ndarray): Support structure type as returned by determine_support_structure.
+        - port_distance (numpy.ndarray): Distance to the port in meters.
         - failure_rate (float, optional): Failure rate for the wind turbines (/yr). Default is 0.08.
 
         Coefficients:
@@ -95,69 +96,120 @@ Functions:
 import arcpy
 import os
 import arcpy
+import numpy as np
+
+# Coefficients for equipment cost calculation based on the support structure and year
+SUPPORT_STRUCTURE_COEFF = {
+    ('monopile', '2020'): (201, 613, 812),
+    ('monopile', '2030'): (181, 552, 370),
+    ('monopile', '2050'): (171, 521, 170),
+    ('jacket', '2020'): (114, -2270, 932),
+    ('jacket', '2030'): (103, -2043, 478),
+    ('jacket', '2050'): (97, -1930, 272),
+    ('floating', '2020'): (0, 774, 1481),
+    ('floating', '2030'): (0, 697, 1223),
+    ('floating', '2050'): (0, 658, 844)
+}
+
+# Coefficients for wind turbine rated cost
+WIND_TURBINE_COEFF = {
+    '2020': 1500,
+    '2030': 1200,
+    '2050': 1000
+}
+
+# Installation coefficients for different vehicles (PSIV capacity in MW/lift, divided by the turbine capacity at use)
+INST_COEFF = {
+    'PSIV': (40, 18.5, 24, 144, 200),
+    'Tug': (0.3, 7.5, 5, 0, 2.5),
+    'AHV': (7, 18.5, 30, 90, 40)
+}
+
+# Decommissioning coefficients for different vehicles (PSIV capacity in MW/lift, divided by the turbine capacity at use)
+DECO_COEFF = {
+    'PSIV': (40, 18.5, 24, 144, 200),
+    'Tug': (0.3, 7.5, 5, 0, 2.5),
+    'AHV': (7, 18.5, 30, 30, 40)
+}
+
+# Logistics coefficients for different vessels
+LOGI_COEFF = {
+    'JUV': (18.5, 50, 150, 1),
+    'Tug': (7.5, 50, 2.5, 2)
+}
+
+# Fields written to the turbine attribute table with their NumPy data type
+FIELDS_TO_ADD = (
+    ('SuppStruct', 'U10'),
+    ('EquiC20', 'f8'),
+    ('EquiC30', 'f8'),
+    ('EquiC50', 'f8'),
+    ('InstC', 'f8'),
+    ('InstT', 'f8'),
+    ('Capex20', 'f8'),
+    ('Capex30', 'f8'),
+    ('Capex50', 'f8'),
+    ('LogiC', 'f8'),
+    ('LogiT', 'f8'),
+    ('Opex20', 'f8'),
+    ('Opex30', 'f8'),
+    ('Opex50', 'f8'),
+    ('Decex', 'f8'),
+    ('DecT', 'f8'),
+)
+
+# Upper water depth bounds (m) of the monopile, jacket and floating support structures
+SUPPORT_STRUCTURE_BINS = np.array([25, 55, 200])
+SUPPORT_STRUCTURE_NAMES = np.array(["monopile", "jacket", "floating", "default"])
 
 def determine_support_structure(water_depth):
     """
     Determines the support structure type based on water depth.
 
     Returns:
-    - str: Support structure type ('monopile', 'jacket', 'floating', or 'default').
+    - numpy.ndarray: Support structure type per water depth ('monopile', 'jacket', 'floating', or 'default').
     """
-    # Define depth ranges for different support structures
-    if 0 <= water_depth <= 25:
-        return "monopile"
-    elif 25 < water_depth <= 55:
-        return "jacket"
-    elif 55 < water_depth <= 200:
-        return "floating"
-    else:
-        # If water depth is outside specified ranges, assign default support structure
-        arcpy.AddWarning(f"Water depth {water_depth} does not fall within specified ranges for support structures. Assigning default support structure.")
-        return "default"
-
-def calc_equip_costs(water_depth, year, turbine_capacity):
+    # Look up the depth range of each water depth, depths above 200 m and negative depths get the default
+    index = np.searchsorted(SUPPORT_STRUCTURE_BINS, water_depth)
+    index[water_depth < 0] = len(SUPPORT_STRUCTURE_BINS)
+    support_structure = SUPPORT_STRUCTURE_NAMES[index]
+
+    # If water depth is outside specified ranges, assign default support structure
+    n_default = np.count_nonzero(support_structure == "default")
+    if n_default:
+        arcpy.AddWarning(f"{n_default} water depths do not fall within specified ranges for support structures. Assigning default support structure.")
+
+    return support_structure
+
+def calc_equip_costs(support_structure, water_depth, year, turbine_capacity):
     """
-    Calculates the equipment costs based on water depth values, year, and turbine capacity.
+    Calculates the equipment costs based on support structure, water depth values, year, and turbine capacity.
 
     Returns:
-    - float: Calculated equipment costs.
+    - numpy.ndarray: Calculated equipment costs.
     """
-    # Coefficients for equipment cost calculation based on the support structure and year
-    support_structure_coeff = {
-        ('monopile', '2020'): (201, 613, 812),
-        ('monopile', '2030'): (181, 552, 370),
-        ('monopile', '2050'): (171, 521, 170),
-        ('jacket', '2020'): (114, -2270, 932),
-        ('jacket', '2030'): (103, -2043, 478),
-        ('jacket', '2050'): (97, -1930, 272),
-        ('floating', '2020'): (0, 774, 1481),
-        ('floating', '2030'): (0, 697, 1223),
-        ('floating', '2050'): (0, 658, 844)
-    }
-
-    # Coefficients for wind turbine rated cost
-    wind_turbine_coeff = {
-        '2020': 1500,
-        '2030': 1200,
-        '2050': 1000
-    }
-
-    # Get the support structure type based on water depth
-    support_structure = determine_support_structure(water_depth)
+    WT_rated_cost = WIND_TURBINE_COEFF[year]
 
-    key = (support_structure, year)
-    if key not in support_structure_coeff:
-        return 0  # Return 0 if coefficients not available
+    # Equipment costs remain 0 where coefficients are not available
+    equip_costs = np.zeros(len(water_depth))
 
-    c1, c2, c3 = support_structure_coeff[key]
-    WT_rated_cost = wind_turbine_coeff[year]
+    for structure in ("monopile", "jacket", "floating"):
+        key = (structure, year)
+        if key not in SUPPORT_STRUCTURE_COEFF:
+            continue
 
-    # Calculate equipment costs using the provided formula
-    return turbine_capacity * ((c1 * (water_depth ** 2)) + (c2 * water_depth) + (c3 * 1000) + (WT_rated_cost))
+        c1, c2, c3 = SUPPORT_STRUCTURE_COEFF[key]
+        mask = support_structure == structure
+        wd = water_depth[mask]
 
-def calc_costs(water_depth, port_distance, turbine_capacity, operation):
+        # Calculate equipment costs using the provided formula
+        equip_costs[mask] = turbine_capacity[mask] * ((c1 * (wd ** 2)) + (c2 * wd) + (c3 * 1000) + (WT_rated_cost))
+
+    return equip_costs
+
+def calc_costs(support_structure, port_distance, turbine_capacity, operation):
     """
-    Calculate installation or decommissioning costs based on the water depth, port distance,
+    Calculate installation or decommissioning costs based on the support structure, port distance,
     and rated power of the wind turbines.
 
     Coefficients:
@@ -175,50 +227,30 @@ def calc_costs(water_depth, port_distance, turbine_capacity, operation):
     Returns:
     - tuple: Calculated hours and costs in Euros.
     """
-    # Installation coefficients for different vehicles
-    inst_coeff = {
-        'PSIV': (40 / turbine_capacity, 18.5, 24, 144, 200),
-        'Tug': (0.3, 7.5, 5, 0, 2.5),
-        'AHV': (7, 18.5, 30, 90, 40)
-    }
-
-    # Decommissioning coefficients for different vehicles
-    deco_coeff = {
-        'PSIV': (40 / turbine_capacity, 18.5, 24, 144, 200),
-        'Tug': (0.3, 7.5, 5, 0, 2.5),
-        'AHV': (7, 18.5, 30, 30, 40)
-    }
-
     # Choose the appropriate coefficients based on the operation type
-    coeff = inst_coeff if operation == 'installation' else deco_coeff
+    coeff = INST_COEFF if operation == 'installation' else DECO_COEFF
 
-    # Determine support structure based on water depth
-    support_structure = determine_support_structure(water_depth).lower()
+    floating = support_structure == 'floating'
 
-    # Determine installation vehicles based on support structure
-    vehicles = ['Tug', 'AHV'] if support_structure == 'floating' else ['PSIV']
+    # Calculate hours and costs separately for each vessel
+    def vessel_hours_costs(c, capacity):
+        hours = (1 / capacity) * ((2 * port_distance / 1000) / c[1] + c[2]) + c[3]
+        return hours, hours * c[4] * 1000 / 24
 
-    # Calculate hours separately for each vessel
-    hours_per_vessel = [
-        ((1 / c[0]) * ((2 * port_distance / 1000) / c[1] + c[2]) + c[3])
-        for c in [coeff[vehicle] for vehicle in vehicles]
-    ]
-    
-    # For floating support structure, use the maximum hours of Tug and AHV
-    total_hours = max(hours_per_vessel) if support_structure == 'floating' else sum(hours_per_vessel)
+    # PSIV capacity converted to units per lift
+    psiv_hours, psiv_costs = vessel_hours_costs(coeff['PSIV'], coeff['PSIV'][0] / turbine_capacity)
+    tug_hours, tug_costs = vessel_hours_costs(coeff['Tug'], coeff['Tug'][0])
+    ahv_hours, ahv_costs = vessel_hours_costs(coeff['AHV'], coeff['AHV'][0])
 
-    # Calculate costs based on the determined hours
-    total_costs = (
-        sum(hours * c[4] * 1000 / 24 for hours, c in zip(hours_per_vessel, [coeff[vehicle] for vehicle in vehicles]))
-        if support_structure == 'floating'
-        else hours_per_vessel[0] * coeff[vehicles[0]][4] * 1000 / 24
-    )
+    # For floating support structure, use the maximum hours of Tug and AHV and the sum of their costs
+    total_hours = np.where(floating, np.maximum(tug_hours, ahv_hours), psiv_hours)
+    total_costs = np.where(floating, tug_costs + ahv_costs, psiv_costs)
 
     return total_hours, total_costs
 
-def logi_costs(water_depth, port_distance, failure_rate=0.08):
+def logi_costs(support_structure, port_distance, failure_rate=0.08):
     """
-    Calculate logistics time and costs for major wind turbine repairs (part of OPEX) based on water depth, port distance, and failure rate for major wind turbine repairs.
+    Calculate logistics time and costs for major wind turbine repairs (part of OPEX) based on support structure, port distance, and failure rate for major wind turbine repairs.
     
     Coefficients:
         - Speed (km/h): Speed of the vessel in kilometers per hour.
@@ -229,20 +261,8 @@ def logi_costs(water_depth, port_distance, failure_rate=0.08):
     Returns:
     - tuple: Logistics time in hours per year and logistics costs in Euros.
     """
-    # Logistics coefficients for different vessels
-    logi_coeff = {
-        'JUV': (18.5, 50, 150, 1),
-        'Tug': (7.5, 50, 2.5, 2)
-    }
-
-    # Determine support structure based on water depth
-    support_structure = determine_support_structure(water_depth).capitalize()
-
-    # Determine logistics vessel based on support structure
-    vessel = 'Tug' if support_structure == 'Floating' else 'JUV'
-
-    # Get logistics coefficients for the chosen vessel
-    c = logi_coeff[vessel]
+    # Get logistics coefficients for the logistics vessel, Tug for floating support structures and JUV otherwise
+    c = np.where((support_structure == 'floating')[:, None], LOGI_COEFF['Tug'], LOGI_COEFF['JUV']).T
 
     # Calculate logistics time in hours per year
     logistics_time = failure_rate * ((2 * c[3] * port_distance / 1000) / c[0] + c[1])
@@ -260,32 +280,6 @@ def update_fields():
     Returns:
     - None
     """
-    
-    # Define fields to be added if they don't exist
-    fields_to_add = [
-        ('SuppStruct', 'TEXT'),
-        ('EquiC20', 'DOUBLE'),
-        ('EquiC30', 'DOUBLE'),
-        ('EquiC50', 'DOUBLE'),
-        ('InstC', 'DOUBLE'),
-        ('InstT', 'DOUBLE'),
-        ('Capex20', 'DOUBLE'),
-        ('Capex30', 'DOUBLE'),
-        ('Capex50', 'DOUBLE'),
-        ('LogiC', 'DOUBLE'),
-        ('LogiT', 'DOUBLE'),
-        ('Opex20', 'DOUBLE'),
-        ('Opex30', 'DOUBLE'),
-        ('Opex50', 'DOUBLE'),
-        ('Decex', 'DOUBLE'),
-        ('DecT', 'DOUBLE'),
-    ]
-    
-    # Function to add a field if it does not exist in the layer
-    def add_field_if_not_exists(layer, field_name, field_type):
-        if field_name not in [field.name for field in arcpy.ListFields(layer)]:
-            arcpy.AddField_management(layer, field_name, field_type)
-            arcpy.AddMessage(f"Added field '{field_name}' to the attribute table.")
 
     # Access the current ArcGIS project
     aprx = arcpy.mp.ArcGISProject("CURRENT")
@@ -312,68 +306,59 @@ def update_fields():
             arcpy.AddError(f"Required field '{field}' is missing in the attribute table.")
             return
 
-    # Add new fields to the attribute table if they do not exist
-    for field_name, field_type in fields_to_add:
-        add_field_if_not_exists(turbine_layer, field_name, field_type)
-
-    # Get the list of fields in the attribute table
-    fields = [field.name for field in arcpy.ListFields(turbine_layer)]
-
-    # Update each row in the attribute table
-    with arcpy.da.UpdateCursor(turbine_layer, fields) as cursor:
-        for row in cursor:
-            # Extract water depth and turbine capacity from the current row
-            water_depth = -row[fields.index("WaterDepth")]  # Invert the sign
-            turbine_capacity = row[fields.index("Capacity")]
-
-            # Determine support structure and assign it to the corresponding field
-            support_structure = determine_support_structure(water_depth).capitalize()
-            row[fields.index("SuppStruct")] = support_structure
-
-            # Iterate over each year and calculate costs and time
-            for year in ['2020', '2030', '2050']:
-                field_name_ec = f"EquiC{year[2:]}"
-                field_name_cap = f"Capex{year[2:]}"
-
-                if field_name_ec in fields and field_name_cap in fields:
-                    # Calculate equipment costs for the current year
-                    equi_costs = calc_equip_costs(water_depth, year, turbine_capacity)
-                    row[fields.index(field_name_ec)] = round(equi_costs)
-
-                    # Calculate installation and decommissioning costs and time
-                    inst_hours, inst_costs = calc_costs(water_depth, row[fields.index("Distance")],
-                                                        turbine_capacity, 'installation')
-                    deco_hours, deco_costs = calc_costs(water_depth, row[fields.index("Distance")],
-                                                        turbine_capacity, 'decommissioning')
-
-                    # Assign calculated values to the corresponding fields
-                    row[fields.index("InstT")] = round(inst_hours)
-                    row[fields.index("DecT")] = round(deco_hours)
-                    row[fields.index("InstC")] = round(inst_costs)
-
-                    # Calculate and assign total capital expenditure for the current year
-                    capex = equi_costs + inst_costs
-                    row[fields.index(field_name_cap)] = round(capex)
-
-                    # Assign decommissioning costs if the field exists
-                    field_name_dec = "Decex"
-                    if field_name_dec in fields:
-                        row[fields.index(field_name_dec)] = round(deco_costs)
-
-                    # Calculate and assign logistics costs and time
-                    logi_costs_value = logi_costs(water_depth, row[fields.index("Distance")])[1]
-                    logi_time = logi_costs(water_depth, row[fields.index("Distance")])[0]
-
-                    row[fields.index("LogiC")] = round(logi_costs_value)
-                    row[fields.index("LogiT")] = round(logi_time)
-
-                    # Calculate material costs and assign operating expenses if the field exists
-                    material_costs = 0.025 * equi_costs
-                    field_name_opex = f"Opex{year[2:]}"
-                    if field_name_opex in fields:
-                        row[fields.index(field_name_opex)] = round(material_costs + logi_costs_value)
-
-            cursor.updateRow(row)
+    # Remove output fields from a previous run, they are recreated when the table is extended
+    output_fields = [field_name for field_name, _ in FIELDS_TO_ADD if field_name in existing_fields]
+    if output_fields:
+        arcpy.DeleteField_management(turbine_layer, output_fields)
+
+    # Read the object IDs and required fields into NumPy arrays
+    oid_field = arcpy.Describe(turbine_layer).OIDFieldName
+    arr = arcpy.da.TableToNumPyArray(turbine_layer, ['OID@'] + required_fields)
+    water_depth = -arr['WaterDepth'].astype(float)  # Invert the sign
+    turbine_capacity = arr['Capacity'].astype(float)
+    port_distance = arr['Distance'].astype(float)
+
+    # Determine support structure once and reuse it for all cost calculations
+    support_structure = determine_support_structure(water_depth)
+    columns = {"SuppStruct": np.char.capitalize(support_structure)}
+
+    # Calculate installation and decommissioning costs and time
+    inst_hours, inst_costs = calc_costs(support_structure, port_distance, turbine_capacity, 'installation')
+    deco_hours, deco_costs = calc_costs(support_structure, port_distance, turbine_capacity, 'decommissioning')
+
+    # Calculate logistics costs and time
+    logi_time, logi_costs_value = logi_costs(support_structure, port_distance)
+
+    columns.update({
+        "InstT": np.round(inst_hours),
+        "DecT": np.round(deco_hours),
+        "InstC": np.round(inst_costs),
+        "Decex": np.round(deco_costs),
+        "LogiC": np.round(logi_costs_value),
+        "LogiT": np.round(logi_time),
+    })
+
+    # Iterate over each year and calculate costs
+    for year in ['2020', '2030', '2050']:
+        # Calculate equipment costs for the current year
+        equi_costs = calc_equip_costs(support_structure, water_depth, year, turbine_capacity)
+        columns[f"EquiC{year[2:]}"] = np.round(equi_costs)
+
+        # Calculate total capital expenditure for the current year
+        columns[f"Capex{year[2:]}"] = np.round(equi_costs + inst_costs)
+
+        # Calculate material costs and operating expenses
+        material_costs = 0.025 * equi_costs
+        columns[f"Opex{year[2:]}"] = np.round(material_costs + logi_costs_value)
+
+    # Assemble the calculated values in a structured array keyed on the object ID
+    out = np.empty(len(arr), dtype=[('JoinID', np.int64)] + list(FIELDS_TO_ADD))
+    out['JoinID'] = arr['OID@']
+    for field_name, values in columns.items():
+        out[field_name] = values
+
+    # Write all calculated values to the attribute table in a single operation
+    arcpy.da.ExtendTable(turbine_layer, oid_field, out, 'JoinID')
 
     arcpy.AddMessage(f"Attribute table of {turbine_layer} updated successfully.")
 
@@ -40,53 +40,42 @@ wind farms, offshore substations, and connections between them, adhering to defi
 import math
 from pyomo.environ import *
 import numpy as np
+from functools import lru_cache
+
+# Define years for installation, operational, and decommissioning
+INST_YEAR = 0  # First year
+OPE_YEAR = INST_YEAR + 5
+DEC_YEAR = OPE_YEAR + 25
+END_YEAR = DEC_YEAR + 2  # End year
+
+# Discount rate
+DISCOUNT_RATE = 0.05
+
+# Equipment and installation costs are incurred in the installation year
+INST_DISCOUNT = (1 + DISCOUNT_RATE) ** -INST_YEAR
+
+# Sum of the discount factors over the operational years [OPE_YEAR, DEC_YEAR) as a geometric series
+OPE_DISCOUNT = ((1 + DISCOUNT_RATE) ** -OPE_YEAR - (1 + DISCOUNT_RATE) ** -DEC_YEAR) / (DISCOUNT_RATE / (1 + DISCOUNT_RATE))
+
+# Decommissioning costs are incurred once, discounted to the decommissioning year
+DECO_DISCOUNT = (1 + DISCOUNT_RATE) ** -DEC_YEAR
 
 def present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs):
     """
-    Calculate the total present value of cable costs.
+    Calculate the total present value of cable costs. The costs can also be given as arrays,
+    in which case the present value of each element is calculated at once.
 
     Parameters:
-        equip_costs (float): Equipment costs.
-        inst_costs (float): Installation costs.
-        ope_costs_yearly (float): Yearly operational costs.
-        deco_costs (float): Decommissioning costs.
+        equip_costs (float or numpy.ndarray): Equipment costs.
+        inst_costs (float or numpy.ndarray): Installation costs.
+        ope_costs_yearly (float or numpy.ndarray): Yearly operational costs.
+        deco_costs (float or numpy.ndarray): Decommissioning costs.
 
     Returns:
-        tuple: A tuple containing the equipment costs, installation costs, and total present value of costs.
-    """
-    # Define years for installation, operational, and decommissioning
-    inst_year = 0  # First year
-    ope_year = inst_year + 5
-    dec_year = ope_year + 25  
-    end_year = dec_year + 2  # End year
-
-    # Discount rate
-    discount_rate = 0.05
-
-    # Define the years as a function of inst_year and end_year
-    years = range(inst_year, end_year + 1)
-
-    # Initialize total operational costs
-    ope_costs = 0
-    
-    # Adjust costs for each year
-    for year in years:
-        # Adjust installation costs
-        if year == inst_year:
-            equip_costs *= (1 + discount_rate) ** -year
-            inst_costs *= (1 + discount_rate) ** -year
-        # Adjust operational costs
-        if year >= inst_year and year < ope_year:
-            inst_costs *= (1 + discount_rate) ** -year
-        elif year >= ope_year and year < dec_year:
-            ope_costs_yearly *= (1 + discount_rate) ** -year
-            ope_costs += ope_costs_yearly  # Accumulate yearly operational costs
-        # Adjust decommissioning costs
-        if year >= dec_year and year <= end_year:
-            deco_costs *= (1 + discount_rate) ** -year
-
+        float or numpy.ndarray: Total present value of costs.
+    """
     # Calculate total present value of costs
-    total_costs = equip_costs + inst_costs + ope_costs + deco_costs
+    total_costs = (equip_costs + inst_costs) * INST_DISCOUNT + ope_costs_yearly * OPE_DISCOUNT + deco_costs * DECO_DISCOUNT
 
     return total_costs
 
@@ -107,117 +96,92 @@ def haversine_distance_scalar(lon1, lat1, lon2, lat2):
     r = 6371 * 1e3
     
     # Convert latitude and longitude from degrees to radians
-    lon1, lat1, lon2, lat2 = np.radians(lon1), np.radians(lat1), np.radians(lon2), np.radians(lat2)
+    lon1, lat1, lon2, lat2 = math.radians(lon1), math.radians(lat1), math.radians(lon2), math.radians(lat2)
 
     # Calculate differences in coordinates
     dlon = lon2 - lon1
     dlat = lat2 - lat1
 
     # Apply Haversine formula
-    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
-    c = 2 * np.arcsin(np.sqrt(a))
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    c = 2 * math.asin(math.sqrt(a))
 
     # Calculate the distance
     distance = c * r 
 
     return distance
 
-def export_cable_costs(distance, required_active_power, polarity = "AC"):
+# Export cable data where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
+"""
+Each column is scaled on load:
+Voltage (kV) > (V)
+Section (mm^2) > (m^2)
+Resistance (mΩ/km) > (Ω/m)
+Capacitance (nF/km) > (F/m)
+Ampacity (A)
+Equipment cost (eu/m)
+Installation cost (eu/m)
+"""
+EXPORT_CABLE_DATA = np.array([
+    (132, 630, 39.5, 209, 818, 406, 335),
+    (132, 800, 32.4, 217, 888, 560, 340),
+    (132, 1000, 27.5, 238, 949, 727, 350),
+    (220, 500, 48.9, 136, 732, 362, 350),
+    (220, 630, 39.1, 151, 808, 503, 360),
+    (220, 800, 31.9, 163, 879, 691, 370),
+    (220, 1000, 27.0, 177, 942, 920, 380),
+    (400, 800, 31.4, 130, 870, 860, 540),
+    (400, 1000, 26.5, 140, 932, 995, 555),
+    (400, 1200, 22.1, 170, 986, 1130, 570),
+    (400, 1400, 18.9, 180, 1015, 1265, 580),
+    (400, 1600, 16.6, 190, 1036, 1400, 600),
+    (400, 2000, 13.2, 200, 1078, 1535, 615)
+], dtype=np.float64) * np.array([1e3, 1e-6, 1e-6, 1e-12, 1, 1, 1])
+
+def export_cable_costs_batch(distances, required_active_powers, polarity = "AC"):
     """
-    Calculate the costs associated with selecting export cables for a given length, desired capacity,
-    and desired voltage.
+    Calculate the costs associated with selecting export cables for arrays of lengths and desired capacities,
+    evaluating all connections and all cables at once.
 
     Parameters:
-        length (float): The length of the cable (in meters).
-        desired_capacity (float): The desired capacity of the cable (in watts).
-        desired_voltage (int): The desired voltage of the cable (in kilovolts).
+        distances (numpy.ndarray): The distances of the connections (in meters).
+        required_active_powers (numpy.ndarray): The desired capacities of the connections (in megawatts).
+        polarity (str, optional): Polarity of the cables ('AC' or 'DC'). Defaults to 'AC'.
 
     Returns:
-        tuple: A tuple containing the equipment costs, installation costs, and total costs
-                associated with the selected HVAC cables.
+        numpy.ndarray: The total costs of the cheapest cable option of each connection.
     """
 
-    length = 1.2 * distance
+    length = 1.2 * np.asarray(distances, dtype=np.float64)
     
-    required_active_power *= 1e6 # (MW > W)
+    required_active_power = np.asarray(required_active_powers, dtype=np.float64) * 1e6 # (MW > W)
     required_voltage = 400
     
-    # Define data_tuples where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
-    cable_data = [
-        (132, 630, 39.5, 209, 818, 406, 335),
-        (132, 800, 32.4, 217, 888, 560, 340),
-        (132, 1000, 27.5, 238, 949, 727, 350),
-        (220, 500, 48.9, 136, 732, 362, 350),
-        (220, 630, 39.1, 151, 808, 503, 360),
-        (220, 800, 31.9, 163, 879, 691, 370),
-        (220, 1000, 27.0, 177, 942, 920, 380),
-        (400, 800, 31.4, 130, 870, 860, 540),
-        (400, 1000, 26.5, 140, 932, 995, 555),
-        (400, 1200, 22.1, 170, 986, 1130, 570),
-        (400, 1400, 18.9, 180, 1015, 1265, 580),
-        (400, 1600, 16.6, 190, 1036, 1400, 600),
-        (400, 2000, 13.2, 200, 1078, 1535, 615)
-    ]
-
-    # Convert data_tuples to a NumPy array
-    data_array = np.array(cable_data)
-    
     # Filter data based on desired voltage
-    data_array = data_array[data_array[:, 0] >= required_voltage]
+    data_array = EXPORT_CABLE_DATA[EXPORT_CABLE_DATA[:, 0] >= required_voltage * 1e3]
 
-    # Define the scaling factors for each column: 
-    """
-    Voltage (kV) > (V)
-    Section (mm^2) > (m^2)
-    Resistance (mΩ/km) > (Ω/m)
-    Capacitance (nF/km) > (F/m)
-    Ampacity (A)
-    Equipment cost (eu/m)
-    Installation cost (eu/m)
-    """
-    scaling_factors = np.array([1e3, 1e-6, 1e-6, 1e-12, 1, 1, 1])
+    power_factor = 0.90
 
-    # Apply scaling to each column in data_array
-    data_array *= scaling_factors
+    # Evaluate all cables at once, each column holds one cable property
+    voltage, ampacity = data_array[:, 0], data_array[:, 4]
+    nominal_power_per_cable = voltage * ampacity
 
-    power_factor = 0.90
-    cable_count = []  # To store the number of cables and corresponding cable data
-
-    for cable in data_array:
-        voltage, resistance, capacitance, ampacity = cable[0], cable[2], cable[3], cable[4]
-        nominal_power_per_cable = voltage * ampacity
-        if polarity == "AC": # Three phase AC
-            ac_apparent_power = required_active_power / power_factor
-            # Determine number of cables needed based on required total apparent power
-            n_cables = np.ceil(ac_apparent_power / nominal_power_per_cable)
-            
-            current = ac_apparent_power / voltage
-            
-        else:  # Assuming polarity == "DC"
-            # Determine number of cables needed based on required power
-            n_cables = np.ceil(required_active_power / nominal_power_per_cable)
-            
-            current = required_active_power / voltage
-        
-        resistive_losses = current ** 2 * resistance * length / n_cables
-        power_eff = (resistive_losses / required_active_power)
-        
-        # Add the calculated data to the list
-        cable_count.append((cable, n_cables))
+    # Three phase AC cables have to carry the apparent power, DC cables the active power
+    required_power = required_active_power / power_factor if polarity == "AC" else required_active_power
 
-    # Calculate the total costs for each cable combination
-    equip_costs_array = [(cable[5] * length * n_cables) for cable, n_cables in cable_count]
-    inst_costs_array = [(cable[6] * length * n_cables) for cable, n_cables in cable_count]
-    
-    # Calculate total costs
-    total_costs_array = np.add(equip_costs_array, inst_costs_array)
+    # Determine number of cables needed based on the required power, with shape (connections, cables)
+    n_cables = np.ceil(required_power[:, None] / nominal_power_per_cable[None, :])
+
+    # Calculate the total costs for each connection and cable combination
+    equip_costs_array = data_array[None, :, 5] * length[:, None] * n_cables
+    inst_costs_array = data_array[None, :, 6] * length[:, None] * n_cables
     
-    # Find the cable combination with the minimum total cost
-    min_cost_index = np.argmin(total_costs_array)
+    # Find the cable combination with the minimum total cost of each connection
+    min_cost_index = np.argmin(equip_costs_array + inst_costs_array, axis=1)[:, None]
 
     # Initialize costs
-    equip_costs = equip_costs_array[min_cost_index]
-    inst_costs = inst_costs_array[min_cost_index]
+    equip_costs = np.take_along_axis(equip_costs_array, min_cost_index, axis=1)[:, 0]
+    inst_costs = np.take_along_axis(inst_costs_array, min_cost_index, axis=1)[:, 0]
     ope_costs_yearly = 0.2 * 1e-2 * equip_costs
     deco_costs = 0.5 * inst_costs
     
@@ -226,177 +190,249 @@ def export_cable_costs(distance, required_active_power, polarity = "AC"):
 
     return total_costs
 
-def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacity, polarity = "AC"):
+@lru_cache(maxsize=None)
+def export_cable_costs(distance, required_active_power, polarity = "AC"):
     """
-    Estimate the costs associated with an offshore substation based on various parameters.
+    Calculate the costs associated with selecting export cables for a given length, desired capacity,
+    and desired voltage.
 
     Parameters:
-    - water_depth (float): Water depth at the location of the offshore substation.
-    - ice_cover (int): Indicator of ice cover presence (1 for presence, 0 for absence).
-    - port_distance (float): Distance from the offshore location to the nearest port.
-    - oss_capacity (float): Capacity of the offshore substation.
-    - polarity (str, optional): Polarity of the substation ('AC' or 'DC'). Defaults to 'AC'.
+        length (float): The length of the cable (in meters).
+        desired_capacity (float): The desired capacity of the cable (in watts).
+        desired_voltage (int): The desired voltage of the cable (in kilovolts).
 
     Returns:
-    - float: Estimated total costs of the offshore substation.
+        tuple: A tuple containing the equipment costs, installation costs, and total costs
+                associated with the selected HVAC cables.
+    """
+    return float(export_cable_costs_batch([distance], [required_active_power], polarity)[0])
+
+# Coefficients for equipment cost calculation based on the support structure
+SUPPORT_STRUCTURE_COEFF = {
+    'sandisland': (3.26, 804, 0, 0),
+    'jacket': (233, 47, 309, 62),
+    'floating': (87, 68, 116, 91)
+}
+
+# Coefficients for power converter cost calculation based on the polarity
+OSS_EQUIP_COEFF = {
+    'AC': (22.87, 7.06),
+    'DC': (102.93, 31.75)
+}
+
+# Installation coefficients for different vehicles
+OSS_INST_COEFF = {
+    ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
+    ('jacket','PSIV'): (1, 18.5, 24, 96, 200),
+    ('floating','HLCV'): (1, 22.5, 10, 0, 40),
+    ('floating','AHV'): (3, 18.5, 30, 90, 40)
+}
+
+# Decommissioning coefficients for different vehicles
+OSS_DECO_COEFF = {
+    ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
+    ('jacket','PSIV'): (1, 18.5, 24, 96, 200),
+    ('floating','HLCV'): (1, 22.5, 10, 0, 40),
+    ('floating','AHV'): (3, 18.5, 30, 30, 40)
+}
+
+@lru_cache(maxsize=1024)
+def support_structure(water_depth):
+    """
+    Determines the support structure type based on water depth.
+
+    Parameters:
+    - water_depth (int): Water depth, truncated to whole meters as the depth ranges start at whole meters.
+
+    Returns:
+    - str: Support structure type ('sandisland', 'jacket', or 'floating').
     """
+    # Define depth ranges for different support structures
+    if water_depth < 30:
+        return "sandisland"
+    elif 30 <= water_depth < 150:
+        return "jacket"
+    elif 150 <= water_depth:
+        return "floating"
+
+def oss_equip_costs(water_depth, support_structure, ice_cover, oss_capacity, polarity):
+    """
+    Calculates the offshore substation equipment costs based on water depth, capacity, and export cable type.
+
+    Returns:
+    - tuple: Support structure costs, power converter costs, and total equipment costs.
+    """
+    # Define parameters
+    c1, c2, c3, c4 = SUPPORT_STRUCTURE_COEFF[support_structure]
     
-    def support_structure(water_depth):
-        """
-        Determines the support structure type based on water depth.
-
-        Returns:
-        - str: Support structure type ('monopile', 'jacket', 'floating', or 'default').
-        """
-        # Define depth ranges for different support structures
-        if water_depth < 30:
-            return "sandisland"
-        elif 30 <= water_depth < 150:
-            return "jacket"
-        elif 150 <= water_depth:
-            return "floating"
-
-    def equip_costs(water_depth, support_structure, ice_cover, oss_capacity, polarity):
-        """
-        Calculates the offshore substation equipment costs based on water depth, capacity, and export cable type.
-
-        Returns:
-        - float: Calculated equipment costs.
-        """
-        # Coefficients for equipment cost calculation based on the support structure and year
-        support_structure_coeff = {
-            'sandisland': (3.26, 804, 0, 0),
-            'jacket': (233, 47, 309, 62),
-            'floating': (87, 68, 116, 91)
-        }
-
-        equip_coeff = {
-            'AC': (22.87, 7.06),
-            'DC': (102.93, 31.75)
-        }
-        
-        # Define parameters
-        c1, c2, c3, c4 = support_structure_coeff[support_structure]
-        
-        c5, c6 = equip_coeff[polarity]
+    c5, c6 = OSS_EQUIP_COEFF[polarity]
+    
+    # Define equivalent electrical power
+    equiv_capacity = 0.5 * oss_capacity if polarity == "AC" else oss_capacity
+
+    if support_structure == 'sandisland':
+        # Calculate foundation costs for sand island
+        area_island = (equiv_capacity * 5)
+        slope = 0.75
+        r_hub = np.sqrt(area_island/np.pi)
+        r_seabed = r_hub + (water_depth + 3) / slope
+        volume_island = (1/3) * slope * np.pi * (r_seabed ** 3 - r_hub ** 3)
         
+        supp_costs = c1 * volume_island + c2 * area_island
+    else:
+        # Calculate foundation costs for jacket/floating
+        supp_costs = (c1 * water_depth + c2 * 1000) * equiv_capacity + (c3 * water_depth + c4 * 1000)
+    
+    # Add support structure costs for ice cover adaptation
+    supp_costs = 1.10 * supp_costs if ice_cover == 1 else supp_costs
+    
+    # Power converter costs
+    conv_costs = c5 * oss_capacity * int(1e3) + c6 * int(1e6) #* int(1e3)
+    
+    # Calculate equipment costs
+    equip_costs = supp_costs + conv_costs
+    
+    return supp_costs, conv_costs, equip_costs
+
+def oss_inst_deco_costs(water_depth, support_structure, port_distance, oss_capacity, polarity, operation):
+    """
+    Calculate installation or decommissioning costs of offshore substations based on the water depth, and port distance.
+
+    Returns:
+    - float: Calculated installation or decommissioning costs.
+    """
+    # Choose the appropriate coefficients based on the operation type
+    coeff = OSS_INST_COEFF if operation == 'inst' else OSS_DECO_COEFF
+
+    if support_structure == 'sandisland':
+        c1, c2, c3, c4, c5 = coeff[('sandisland','SUBV')]
         # Define equivalent electrical power
         equiv_capacity = 0.5 * oss_capacity if polarity == "AC" else oss_capacity
-
-        if support_structure == 'sandisland':
-            # Calculate foundation costs for sand island
-            area_island = (equiv_capacity * 5)
-            slope = 0.75
-            r_hub = np.sqrt(area_island/np.pi)
-            r_seabed = r_hub + (water_depth + 3) / slope
-            volume_island = (1/3) * slope * np.pi * (r_seabed ** 3 - r_hub ** 3)
-            
-            supp_costs = c1 * volume_island + c2 * area_island
-        else:
-            # Calculate foundation costs for jacket/floating
-            supp_costs = (c1 * water_depth + c2 * 1000) * equiv_capacity + (c3 * water_depth + c4 * 1000)
         
-        # Add support structure costs for ice cover adaptation
-        supp_costs = 1.10 * supp_costs if ice_cover == 1 else supp_costs
+        # Calculate installation costs for sand island
+        water_depth = max(0, water_depth)
+        area_island = (equiv_capacity * 5)
+        slope = 0.75
+        r_hub = np.sqrt(area_island/np.pi)
+        r_seabed = r_hub + (water_depth + 3) / slope
+        volume_island = (1/3) * slope * np.pi * (r_seabed ** 3 - r_hub ** 3)
         
-        # Power converter costs
-        conv_costs = c5 * oss_capacity * int(1e3) + c6 * int(1e6) #* int(1e3)
+        total_costs = ((volume_island / c1) * ((2 * port_distance) / c2) + (volume_island / c3) + (volume_island / c4)) * (c5 * 1000) / 24
         
-        # Calculate equipment costs
-        equip_costs = supp_costs + conv_costs
+    elif support_structure == 'jacket':
+        c1, c2, c3, c4, c5 = coeff[('jacket','PSIV')]
+        # Calculate installation costs for jacket
+        total_costs = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
+    elif support_structure == 'floating':
+        total_costs = 0
         
-        return supp_costs, conv_costs, equip_costs
-
-    def inst_deco_costs(water_depth, support_structure, port_distance, oss_capacity, polarity, operation):
-        """
-        Calculate installation or decommissioning costs of offshore substations based on the water depth, and port distance.
-
-        Returns:
-        - float: Calculated installation or decommissioning costs.
-        """
-        # Installation coefficients for different vehicles
-        inst_coeff = {
-            ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-            ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-            ('floating','AHV'): (3, 18.5, 30, 90, 40)
-        }
-
-        # Decommissioning coefficients for different vehicles
-        deco_coeff = {
-            ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-            ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-            ('floating','AHV'): (3, 18.5, 30, 30, 40)
-        }
-
-        # Choose the appropriate coefficients based on the operation type
-        coeff = inst_coeff if operation == 'inst' else deco_coeff
-
-        if support_structure == 'sandisland':
-            c1, c2, c3, c4, c5 = coeff[('sandisland','SUBV')]
-            # Define equivalent electrical power
-            equiv_capacity = 0.5 * oss_capacity if polarity == "AC" else oss_capacity
-            
-            # Calculate installation costs for sand island
-            water_depth = max(0, water_depth)
-            area_island = (equiv_capacity * 5)
-            slope = 0.75
-            r_hub = np.sqrt(area_island/np.pi)
-            r_seabed = r_hub + (water_depth + 3) / slope
-            volume_island = (1/3) * slope * np.pi * (r_seabed ** 3 - r_hub ** 3)
-            
-            total_costs = ((volume_island / c1) * ((2 * port_distance) / c2) + (volume_island / c3) + (volume_island / c4)) * (c5 * 1000) / 24
-            
-        elif support_structure == 'jacket':
-            c1, c2, c3, c4, c5 = coeff[('jacket' 'PSIV')]
-            # Calculate installation costs for jacket
-            total_costs = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
-        elif support_structure == 'floating':
-            total_costs = 0
-            
-            # Iterate over the coefficients for floating (HLCV and AHV)
-            for vessel_type in [('floating', 'HLCV'), ('floating', 'AHV')]:
-                c1, c2, c3, c4, c5 = coeff[vessel_type]
-                # Calculate installation costs for the current vessel type
-                vessel_costs = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
-                # Add the costs for the current vessel type to the total costs
-                total_costs += vessel_costs
-        else:
-            total_costs = None
-            
-        return inst_deco_costs
-
-    def oper_costs(support_structure, supp_costs, conv_costs):
+        # Iterate over the coefficients for floating (HLCV and AHV)
+        for vessel_type in [('floating', 'HLCV'), ('floating', 'AHV')]:
+            c1, c2, c3, c4, c5 = coeff[vessel_type]
+            # Calculate installation costs for the current vessel type
+            vessel_costs = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
+            # Add the costs for the current vessel type to the total costs
+            total_costs += vessel_costs
+    else:
+        total_costs = None
         
-        ope_exp = 0.03 * conv_costs + 0.015 * supp_costs if support_structure == "sandisland" else 0.03 * conv_costs
-        
-        return ope_exp
+    return total_costs
+
+def oss_oper_costs(support_structure, supp_costs, conv_costs):
+    """
+    Calculate the yearly operational costs of offshore substations.
+
+    Returns:
+    - float: Calculated yearly operational costs.
+    """
+    ope_exp = 0.03 * conv_costs + 0.015 * supp_costs if support_structure == "sandisland" else 0.03 * conv_costs
+    
+    return ope_exp
+
+@lru_cache(maxsize=None)
+def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacity, polarity = "AC"):
+    """
+    Estimate the costs associated with an offshore substation based on various parameters.
+
+    Parameters:
+    - water_depth (float): Water depth at the location of the offshore substation.
+    - ice_cover (int): Indicator of ice cover presence (1 for presence, 0 for absence).
+    - port_distance (float): Distance from the offshore location to the nearest port.
+    - oss_capacity (float): Capacity of the offshore substation.
+    - polarity (str, optional): Polarity of the substation ('AC' or 'DC'). Defaults to 'AC'.
 
+    Returns:
+    - float: Estimated total costs of the offshore substation.
+    """
     # Determine support structure
-    supp_structure = support_structure(water_depth)
+    supp_structure = support_structure(int(water_depth))
     
     # Calculate equipment costs
-    supp_costs, conv_costs, equip_costs =  equip_costs(water_depth, supp_structure, ice_cover, oss_capacity, polarity)
+    supp_costs, conv_costs, equip_costs = oss_equip_costs(water_depth, supp_structure, ice_cover, oss_capacity, polarity)
 
     # Calculate installation and decommissioning costs
-    inst_costs = inst_deco_costs(water_depth, supp_structure, port_distance, oss_capacity, polarity, "inst")
-    deco_costs = inst_deco_costs(water_depth, supp_structure, port_distance, oss_capacity, polarity, "deco")
+    inst_costs = oss_inst_deco_costs(water_depth, supp_structure, port_distance, oss_capacity, polarity, "inst")
+    deco_costs = oss_inst_deco_costs(water_depth, supp_structure, port_distance, oss_capacity, polarity, "deco")
 
     # Calculate yearly operational costs
-    ope_costs_yearly = oper_costs(support_structure, supp_costs, conv_costs)
+    ope_costs_yearly = oss_oper_costs(supp_structure, supp_costs, conv_costs)
     
     # Calculate present value of costs    
     oss_costs = present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs)
     
     return oss_costs
 
+def offshore_substation_costs_batch(water_depths, ice_covers, port_distances, oss_capacities, polarity = "AC"):
+    """
+    Estimate the costs of offshore substations for arrays of parameters, evaluating each unique
+    combination of parameters once.
+
+    Parameters:
+    - water_depths (numpy.ndarray): Water depths at the locations of the offshore substations.
+    - ice_covers (numpy.ndarray): Indicators of ice cover presence (1 for presence, 0 for absence).
+    - port_distances (numpy.ndarray): Distances from the offshore locations to the nearest port.
+    - oss_capacities (numpy.ndarray): Capacities of the offshore substations.
+    - polarity (str, optional): Polarity of the substations ('AC' or 'DC'). Defaults to 'AC'.
+
+    Returns:
+    - numpy.ndarray: Estimated total costs of each offshore substation.
+    """
+    params = np.column_stack((water_depths, ice_covers, port_distances, oss_capacities)).astype(np.float64)
+    unique_params, inverse = np.unique(params, axis=0, return_inverse=True)
+    
+    unique_costs = np.array([offshore_substation_costs(wdepth, int(icover), pdist, capacity, polarity) 
+                             for wdepth, icover, pdist, capacity in unique_params.tolist()], dtype=np.float64)
+    
+    return unique_costs[inverse.ravel()]
+
+def linear_cost_coeffs(costs_min, costs_max, capacities_min, capacities_max):
+    """
+    Split costs evaluated at a minimum and a maximum capacity into a fixed cost and a cost per unit of capacity,
+    along the line through both points. Where both capacities are equal, the whole cost is fixed.
+
+    Parameters:
+    - costs_min (numpy.ndarray): Costs at the minimum capacities.
+    - costs_max (numpy.ndarray): Costs at the maximum capacities.
+    - capacities_min (numpy.ndarray): Minimum capacities.
+    - capacities_max (numpy.ndarray): Maximum capacities.
+
+    Returns:
+    - tuple: Fixed costs and costs per unit of capacity, as numpy.ndarrays.
+    """
+    capacity_range = capacities_max - capacities_min
+    capacity_costs = np.divide(costs_max - costs_min, capacity_range, out=np.zeros_like(capacity_range), where=capacity_range > 0)
+
+    # A negative fixed cost would make selecting an unused component profitable
+    fixed_costs = np.maximum(costs_min - capacity_costs * capacities_min, 0)
+
+    return fixed_costs, capacity_costs
+
 
 from pyomo.environ import *
 import numpy as np
 import os
+from collections import defaultdict
 from math import radians, cos, sin, asin, sqrt
-from itertools import product
 
 def haversine(lon1, lat1, lon2, lat2):
     """
@@ -414,31 +450,114 @@ def haversine(lon1, lat1, lon2, lat2):
     r = 6371  # Radius of Earth in kilometers
     return c * r
 
-def find_viable_iac(wf_lon, wf_lat, oss_lon, oss_lat):
+def haversine_rad(lon1, lat1, cos_lat1, lon2, lat2, cos_lat2):
+    """
+    Calculate the great-circle distance between two points on the Earth, specified in radians
+    together with the precomputed cosine of their latitudes.
+    """
+    a = np.sin((lat2 - lat1) / 2.0)**2 + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2.0)**2
+    return (2 * 6371) * np.arcsin(np.sqrt(a))
+
+# Number of rows of the first set for which distances are calculated at once
+PAIR_BLOCK_ROWS = 4096
+
+def find_pairs_within(keys1, keys2, lon1, lat1, lon2, lat2, max_distance):
+    """
+    Find all pairs of points from two sets within a maximum distance. Pairs outside the latitude and
+    longitude bounding box of the maximum distance are rejected first, and the haversine distance is
+    only calculated for the remaining pairs.
+
+    Parameters are arrays of keys and the longitude and latitude values aligned with them, and the maximum distance in km.
+
+    Returns:
+    - dict: Distance in km of each pair within the maximum distance, keyed by (key1, key2).
+    """
+    # Convert the coordinates of each point to radians once, together with the cosine of the latitude
+    lon1, lat1, lon2, lat2 = np.radians(lon1), np.radians(lat1), np.radians(lon2), np.radians(lat2)
+    cos_lat1, cos_lat2 = np.cos(lat1), np.cos(lat2)
+
+    # Angular distance of the maximum distance on a sphere with the Earth's radius
+    max_angle = max_distance / 6371
+    
+    # Largest latitude difference of pairs within the maximum distance
+    max_dlat = max_angle
+    
+    # Largest longitude difference of pairs within the maximum distance, at the latitude furthest from the equator
+    max_lat = max(np.abs(lat1).max(initial=0), np.abs(lat2).max(initial=0)) + max_angle
+    if np.cos(max_lat) > np.sin(max_angle):
+        max_dlon = np.arcsin(np.sin(max_angle) / np.cos(max_lat))
+    else:
+        max_dlon = np.pi
+
+    pairs = {}
+    # Process the first set in blocks of rows, so the masks of each block stay small for large datasets
+    for start in range(0, len(keys1), PAIR_BLOCK_ROWS):
+        block = slice(start, start + PAIR_BLOCK_ROWS)
+
+        # Bounding box check of shape (block rows, len(keys2)), broadcast from the 1D coordinate arrays
+        dlon = np.abs(lon1[block, None] - lon2[None, :])
+        in_box = (np.abs(lat1[block, None] - lat2[None, :]) <= max_dlat) & (np.minimum(dlon, 2 * np.pi - dlon) <= max_dlon)
+        rows, cols = np.nonzero(in_box)
+        rows += start
+
+        # Haversine distances of the pairs inside the bounding box only
+        distances = haversine_rad(lon1[rows], lat1[rows], cos_lat1[rows], lon2[cols], lat2[cols], cos_lat2[cols])
+        
+        within = distances <= max_distance
+        pairs.update({(keys1[i], keys2[j]): float(d) for i, j, d in zip(rows[within], cols[within], distances[within])})
+
+    return pairs
+
+def find_viable_iac(wf_keys, oss_keys, wf_lon, wf_lat, oss_lon, oss_lat):
     """
-    Find all pairs of offshore and onshore substations within 300km using NumPy.
+    Find all pairs of wind farms and offshore substations within 150km using NumPy.
     
-    Parameters are dictionaries keyed by substation IDs with longitude and latitude values.
+    Parameters are arrays of keys and the longitude and latitude values aligned with them.
+
+    Returns:
+    - dict: Distance in km of each viable connection, keyed by (wf_key, oss_key).
     """
-    connections = []
-    for wf_key, oss_key in product(wf_lon.keys(), oss_lon.keys()):
-        distance = haversine(wf_lon[wf_key], wf_lat[wf_key], oss_lon[oss_key], oss_lat[oss_key])
-        if distance <= 150:
-            connections.append((wf_key, oss_key))
-    return connections
+    return find_pairs_within(wf_keys, oss_keys, wf_lon, wf_lat, oss_lon, oss_lat, 150)
 
-def find_viable_ec(oss_lon, oss_lat, onss_lon, onss_lat):
+def find_viable_ec(oss_keys, onss_keys, oss_lon, oss_lat, onss_lon, onss_lat):
     """
     Find all pairs of offshore and onshore substations within 300km.
     
-    Parameters are dictionaries keyed by substation IDs with longitude and latitude values.
+    Parameters are arrays of keys and the longitude and latitude values aligned with them.
+
+    Returns:
+    - dict: Distance in km of each viable connection, keyed by (oss_key, onss_key).
+    """
+    return find_pairs_within(oss_keys, onss_keys, oss_lon, oss_lat, onss_lon, onss_lat, 300)
+
+def load_dataset(dataset_file):
+    """
+    Load a dataset from a .npy file, memory-mapped so only the columns that are used are read from disk.
+
+    Parameters:
+    - dataset_file (str): Path to the .npy dataset file.
+
+    Returns:
+    - numpy.ndarray: The loaded dataset.
+    """
+    try:
+        return np.load(dataset_file, mmap_mode='r')
+    except ValueError:
+        # Datasets holding Python objects can not be memory-mapped and are unpickled instead
+        return np.load(dataset_file, allow_pickle=True)
+
+def dataset_column(dataset, index):
+    """
+    Get a column of a loaded dataset by position.
+
+    Parameters:
+    - dataset (numpy.ndarray): Structured array or 2D array as loaded from a .npy dataset file.
+    - index (int): Position of the column.
+
+    Returns:
+    - numpy.ndarray: The column values.
     """
-    connections = []
-    for oss_key, onss_key in product(oss_lon.keys(), onss_lon.keys()):
-        distance = haversine(oss_lon[oss_key], oss_lat[oss_key], onss_lon[onss_key], onss_lat[onss_key])
-        if distance <= 300:
-            connections.append((oss_key, onss_key))
-    return connections
+    return dataset[dataset.dtype.names[index]] if dataset.dtype.names else dataset[:, index]
 
 def opt_model(workspace_folder):
     """
@@ -461,46 +580,52 @@ def opt_model(workspace_folder):
     oss_dataset_file = os.path.join(workspace_folder, 'oss_dataset.npy')
     onss_dataset_file = os.path.join(workspace_folder, 'onss_dataset.npy')
     
-    wf_dataset = np.load(wf_dataset_file, allow_pickle=True)
-    oss_dataset = np.load(oss_dataset_file, allow_pickle=True)
-    onss_dataset = np.load(onss_dataset_file, allow_pickle=True)
+    wf_dataset = load_dataset(wf_dataset_file)
+    oss_dataset = load_dataset(oss_dataset_file)
+    onss_dataset = load_dataset(onss_dataset_file)
 
     # Keys data
-    wf_keys = [data[0] for data in wf_dataset]
-    oss_keys = [data[0] for data in oss_dataset]
-    onss_keys = [data[0] for data in onss_dataset]
-
-    # Wind farm data
-    wf_iso, wf_lon, wf_lat, wf_cap, wf_costs = {}, {}, {}, {}, {}
-
-    for data in wf_dataset:
-        key = data[0]
-        wf_iso[key] = data[1]
-        wf_lon[key] = data[2]
-        wf_lat[key] = data[3]
-        wf_cap[key] = data[5]
-        wf_costs[key] = data[6]
-
-    # Offshore substation data
-    oss_iso, oss_lon, oss_lat, oss_wdepth, oss_icover, oss_pdist = {}, {}, {}, {}, {}, {}
-
-    for data in oss_dataset:
-        key = data[0]
-        oss_iso[key] = data[1]
-        oss_lon[key] = data[2]
-        oss_lat[key] = data[3]
-        oss_wdepth[key] = data[4]
-        oss_icover[key] = data[5]
-        oss_pdist[key] = data[6]
-    
-    # Onshore substation data
-    onss_iso, onss_lon, onss_lat = {}, {}, {}
-
-    for data in onss_dataset:
-        key = data[0]
-        onss_iso[key] = data[1]
-        onss_lon[key] = data[2]
-        onss_lat[key] = data[3]
+    wf_keys_arr = dataset_column(wf_dataset, 0)
+    oss_keys_arr = dataset_column(oss_dataset, 0)
+    onss_keys_arr = dataset_column(onss_dataset, 0)
+
+    wf_keys = wf_keys_arr.tolist()
+    oss_keys = oss_keys_arr.tolist()
+    onss_keys = onss_keys_arr.tolist()
+
+    # Wind farm data as typed columns
+    wf_lon_arr = dataset_column(wf_dataset, 2).astype(np.float64)
+    wf_lat_arr = dataset_column(wf_dataset, 3).astype(np.float64)
+    wf_cap_arr = dataset_column(wf_dataset, 5).astype(np.float64)
+    wf_costs_arr = dataset_column(wf_dataset, 6).astype(np.float64)
+
+    # Offshore substation data as typed columns
+    oss_lon_arr = dataset_column(oss_dataset, 2).astype(np.float64)
+    oss_lat_arr = dataset_column(oss_dataset, 3).astype(np.float64)
+    oss_wdepth_arr = dataset_column(oss_dataset, 4).astype(np.float64)
+    oss_icover_arr = dataset_column(oss_dataset, 5).astype(np.int64)
+    oss_pdist_arr = dataset_column(oss_dataset, 6).astype(np.float64)
+
+    # Onshore substation data as typed columns
+    onss_lon_arr = dataset_column(onss_dataset, 2).astype(np.float64)
+    onss_lat_arr = dataset_column(onss_dataset, 3).astype(np.float64)
+
+    # Wind farm data keyed by ID
+    wf_lon = dict(zip(wf_keys, wf_lon_arr.tolist()))
+    wf_lat = dict(zip(wf_keys, wf_lat_arr.tolist()))
+    wf_cap = dict(zip(wf_keys, wf_cap_arr.tolist()))
+    wf_costs = dict(zip(wf_keys, wf_costs_arr.tolist()))
+
+    # Offshore substation data keyed by ID
+    oss_lon = dict(zip(oss_keys, oss_lon_arr.tolist()))
+    oss_lat = dict(zip(oss_keys, oss_lat_arr.tolist()))
+    oss_wdepth = dict(zip(oss_keys, oss_wdepth_arr.tolist()))
+    oss_icover = dict(zip(oss_keys, oss_icover_arr.tolist()))
+    oss_pdist = dict(zip(oss_keys, oss_pdist_arr.tolist()))
+    
+    # Onshore substation data keyed by ID
+    onss_lon = dict(zip(onss_keys, onss_lon_arr.tolist()))
+    onss_lat = dict(zip(onss_keys, onss_lat_arr.tolist()))
 
     
     """
@@ -525,51 +650,83 @@ def opt_model(workspace_folder):
     """
     Define decision variables
     """
-    # Calculate viable connections
-    viable_iac = find_viable_iac(wf_lon, wf_lat, oss_lon, oss_lat)
-    viable_ec = find_viable_ec(oss_lon, oss_lat, onss_lon, onss_lat)
+    # Calculate viable connections and their distances
+    iac_dist = find_viable_iac(wf_keys, oss_keys, wf_lon_arr, wf_lat_arr, oss_lon_arr, oss_lat_arr)
+    ec_dist = find_viable_ec(oss_keys, onss_keys, oss_lon_arr, oss_lat_arr, onss_lon_arr, onss_lat_arr)
+
+    viable_iac = list(iac_dist)
+    viable_ec = list(ec_dist)
 
     # You can then integrate these connections into your model as needed
     # For example, as a Pyomo Set
     model.viable_iac = Set(initialize= viable_iac, dimen=2)
     model.viable_ec = Set(initialize= viable_ec, dimen=2)
+
+    # Neighbouring components that can be connected to each wind farm and offshore substation
+    oss_to_wf, wf_to_oss, oss_to_onss = defaultdict(list), defaultdict(list), defaultdict(list)
+    for wf, oss in viable_iac:
+        oss_to_wf[oss].append(wf)
+        wf_to_oss[wf].append(oss)
+    for oss, onss in viable_ec:
+        oss_to_onss[oss].append(onss)
     
     model.select_wf = Var(wf_keys, within=Binary)
     model.select_oss = Var(oss_keys, within=Binary)
     model.select_iac = Var(model.viable_iac, within=Binary)
     model.select_ec = Var(model.viable_ec, within=Binary)
+    
+    # Capacity transmitted through each export cable
+    model.ec_flow = Var(model.viable_ec, within=NonNegativeReals)
 
 
     """
     Define Expressions
     """
     
-    # Distance expressions
-    def iac_dist_rule(model, wf, oss):
-        return haversine(model.wf_lon[wf], model.wf_lat[wf], model.oss_lon[oss], model.oss_lat[oss])
-    model.iac_dist = Expression(wf_keys, oss_keys, rule=iac_dist_rule)
+    # Distances of the viable connections, taken from the viability check
+    model.iac_dist = Param(model.viable_iac, initialize= iac_dist, within= NonNegativeReals)
+    model.ec_dist = Param(model.viable_ec, initialize= ec_dist, within= NonNegativeReals)
     
-    def ec_dist_rule(model, oss, onss):
-        return haversine(model.oss_lon[oss], model.oss_lat[oss], model.onss_lon[onss], model.onss_lat[onss])
-    model.ec_dist = Expression(oss_keys, onss_keys, rule=ec_dist_rule)
-    
-    # Capacity expressions
+    # Capacity expressions, only over the viable connections
     def oss_capacity_rule(model, oss):
-        return sum(model.wf_capacity[wf] * model.wf_oss_connection[wf, oss] for wf in wf_keys)
+        return quicksum(model.wf_cap[wf] * model.select_iac[wf, oss] for wf in oss_to_wf[oss])
     model.oss_capacity = Expression(oss_keys, rule=oss_capacity_rule)
 
-    def ec_capacity_rule(model, ec):
-        return sum(model.oss_capacity[oss] * model.oss_onss_connection[wf, ec] for wf in wf_keys)
+    def ec_capacity_rule(model, oss, onss):
+        return model.oss_capacity[oss] * model.select_ec[oss, onss]
     model.ec_capacity = Expression(model.viable_ec, rule=ec_capacity_rule)
     
-    # Cost expressions
-    def oss_cost_rule(model, oss):
-        return offshore_substation_costs(model.oss_wdepth[oss], model.oss_icec[oss], model.oss_pdist[oss], model.oss_capacity[oss], "AC")
-    model.oss_costs = Expression(oss_keys, rule=oss_cost_rule)
+    # Smallest and largest capacity an offshore substation can carry: a single wind farm within reach, or all of them
+    oss_min_cap = np.array([min((wf_cap[wf] for wf in oss_to_wf[oss]), default=0) for oss in oss_keys], dtype=np.float64)
+    oss_max_cap = np.array([sum(wf_cap[wf] for wf in oss_to_wf[oss]) for oss in oss_keys], dtype=np.float64)
+    
+    # Offshore substation costs split in a fixed part and a part per unit of connected capacity
+    oss_costs_min = offshore_substation_costs_batch(oss_wdepth_arr, oss_icover_arr, oss_pdist_arr, oss_min_cap, "AC")
+    oss_costs_max = offshore_substation_costs_batch(oss_wdepth_arr, oss_icover_arr, oss_pdist_arr, oss_max_cap, "AC")
+    oss_fixed_costs, oss_capacity_costs = linear_cost_coeffs(oss_costs_min, oss_costs_max, oss_min_cap, oss_max_cap)
+    
+    model.oss_fixed_costs = Param(oss_keys, initialize= dict(zip(oss_keys, oss_fixed_costs.tolist())), within= NonNegativeReals)
+    model.oss_capacity_costs = Param(oss_keys, initialize= dict(zip(oss_keys, oss_capacity_costs.tolist())), within= NonNegativeReals)
+    
+    # Export cable costs split the same way, over the capacities the offshore substation can carry
+    oss_index = {oss: i for i, oss in enumerate(oss_keys)}
+    ec_oss_rows = np.array([oss_index[oss] for oss, _ in viable_ec], dtype=np.int64)
+    ec_dist_arr = np.array([ec_dist[oss, onss] for oss, onss in viable_ec], dtype=np.float64)
+    ec_min_cap, ec_max_cap = oss_min_cap[ec_oss_rows], oss_max_cap[ec_oss_rows]
+    
+    ec_costs_min = export_cable_costs_batch(ec_dist_arr, ec_min_cap, polarity="AC")
+    ec_costs_max = export_cable_costs_batch(ec_dist_arr, ec_max_cap, polarity="AC")
+    ec_fixed_costs, ec_capacity_costs = linear_cost_coeffs(ec_costs_min, ec_costs_max, ec_min_cap, ec_max_cap)
     
-    def ec_cost_rule(model, oss, onss):
-        return export_cable_costs(model.ec_dist[oss, onss], model.ec_capacity[oss, onss], polarity="AC")
-    model.ec_costs = Expression(model.viable_ec, rule=ec_cost_rule)
+    model.ec_fixed_costs = Param(model.viable_ec, initialize= dict(zip(viable_ec, ec_fixed_costs.tolist())), within= NonNegativeReals)
+    model.ec_capacity_costs = Param(model.viable_ec, initialize= dict(zip(viable_ec, ec_capacity_costs.tolist())), within= NonNegativeReals)
+
+    # Inter-array cables are priced with the same cable model, each carrying the capacity of its wind farm
+    iac_dist_arr = np.array([iac_dist[wf, oss] for wf, oss in viable_iac], dtype=np.float64)
+    iac_cap_arr = np.array([wf_cap[wf] for wf, _ in viable_iac], dtype=np.float64)
+    
+    iac_costs = export_cable_costs_batch(iac_dist_arr, iac_cap_arr, polarity="AC")
+    model.iac_costs = Param(model.viable_iac, initialize= dict(zip(viable_iac, iac_costs.tolist())), within= NonNegativeReals)
     
     
     """
@@ -577,13 +734,13 @@ def opt_model(workspace_folder):
     """
     def total_cost_rule(model):
         # Summing wind farm costs
-        wf_total_cost = sum(wf_costs[wf] * model.select_wf[wf] for wf in wf_keys)
+        wf_total_cost = quicksum(wf_costs[wf] * model.select_wf[wf] for wf in wf_keys)
         # Summing offshore substation costs
-        oss_total_cost = sum(model.oss_costs[oss] * model.select_oss[oss] for oss in oss_keys)
+        oss_total_cost = quicksum(model.oss_fixed_costs[oss] * model.select_oss[oss] + model.oss_capacity_costs[oss] * model.oss_capacity[oss] for oss in oss_keys)
         # Summing inter array cable costs for viable connections
-        iac_total_cost = sum(model.ec_costs[wf, oss] for (wf, oss) in model.viable_ec)
+        iac_total_cost = quicksum(model.iac_costs[wf, oss] * model.select_iac[wf, oss] for (wf, oss) in model.viable_iac)
         # Summing export cable costs for viable connections
-        ec_total_cost = sum(model.ec_costs[oss, onss] for (oss, onss) in model.viable_ec)
+        ec_total_cost = quicksum(model.ec_fixed_costs[oss, onss] * model.select_ec[oss, onss] + model.ec_capacity_costs[oss, onss] * model.ec_flow[oss, onss] for (oss, onss) in model.viable_ec)
         # The objective is to minimize the total cost
         return wf_total_cost + oss_total_cost + iac_total_cost + ec_total_cost
 
@@ -598,18 +755,18 @@ def opt_model(workspace_folder):
     # Connection constraints
     # Constraint 1: If a wind farm is selected, it must be connected to at least one offshore substation
     def wf_must_connect_to_oss_rule(model, wf):
-        return sum(model.select_iac[wf, oss] for oss in oss_keys if (wf, oss) in model.viable_iac) >= model.select_wf[wf]
+        return quicksum(model.select_iac[wf, oss] for oss in wf_to_oss[wf]) >= model.select_wf[wf]
     model.wf_must_connect_to_oss = Constraint(wf_keys, rule=wf_must_connect_to_oss_rule)
 
     # Constraint 2: If an offshore substation is selected, it must connect to at least one onshore substation
     def oss_connection_rule(model, oss):
-        return sum(model.select_ec[oss, onss] for onss in onss_keys if (oss, onss) in model.viable_ec) >= model.select_oss[oss]
+        return quicksum(model.select_ec[oss, onss] for onss in oss_to_onss[oss]) >= model.select_oss[oss]
     model.oss_connection = Constraint(oss_keys, rule=oss_connection_rule)
 
     # Constraint 3: Wind Farm Selection Implies Inter-Array Cable Selection
-    def wf_select_implies_iac_select_rule(model, wf, oss):
-        return model.select_wf[wf] <= sum(model.select_iac[wf, oss] for oss in oss_keys if (wf, oss) in model.viable_iac)
-    model.wf_select_implies_iac_select = Constraint(wf_keys, oss_keys, rule=wf_select_implies_iac_select_rule)
+    def wf_select_implies_iac_select_rule(model, wf):
+        return model.select_wf[wf] <= quicksum(model.select_iac[wf, oss] for oss in wf_to_oss[wf])
+    model.wf_select_implies_iac_select = Constraint(wf_keys, rule=wf_select_implies_iac_select_rule)
 
     # Constraint 4: Inter-Array Cable Selection Implies Offshore Substation Selection
     def iac_select_implies_oss_select_rule(model, wf, oss):
@@ -617,9 +774,9 @@ def opt_model(workspace_folder):
     model.iac_select_implies_oss_select = Constraint(model.viable_iac, rule=iac_select_implies_oss_select_rule)
 
     # Constraint 5: Offshore Substation Selection Implies Export Cable Selection
-    def oss_select_implies_ec_select_rule(model, oss, onss):
-        return model.select_oss[oss] <= sum(model.select_ec[oss, onss] for onss in onss_keys if (oss, onss) in model.viable_ec)
-    model.oss_select_implies_ec_select = Constraint(oss_keys, onss_keys, rule=oss_select_implies_ec_select_rule)
+    def oss_select_implies_ec_select_rule(model, oss):
+        return model.select_oss[oss] <= quicksum(model.select_ec[oss, onss] for onss in oss_to_onss[oss])
+    model.oss_select_implies_ec_select = Constraint(oss_keys, rule=oss_select_implies_ec_select_rule)
 
     # Constraint 6: Export Cable Selection Implies Onshore Substation Selection
     # This constraint assumes the introduction of a decision variable for selecting onshore substations, model.select_onss[onss].
@@ -634,7 +791,7 @@ def opt_model(workspace_folder):
     def min_capacity_rule(model):
         # The total capacity of selected wind farms must meet or exceed a minimum requirement
         min_total_capacity = 1000  # Example minimum total capacity in MW
-        return sum(model.wf_cap[wf] * model.select_wf[wf] for wf in wf_keys) >= min_total_capacity
+        return quicksum(model.wf_cap[wf] * model.select_wf[wf] for wf in wf_keys) >= min_total_capacity
     model.min_capacity = Constraint(rule=min_capacity_rule)
 
     # Constraint 8: Matching Wind Farm Capacity and Inter-Array Cable Capacity
@@ -645,23 +802,37 @@ def opt_model(workspace_folder):
     model.iac_capacity_matching = Constraint(model.viable_iac, rule=iac_capacity_matching_rule)
 
     # Constraint 9: Matching Inter-Array Cable Capacity and Offshore Substation Capacity
-    def oss_capacity_rule(model, oss):
+    def oss_capacity_constraint_rule(model, oss):
         # The capacity of an offshore substation should equal the sum of capacities of all wind farms
         # connected to it through selected inter-array cables.
-        connected_wf_capacity = sum(model.wf_cap[wf] * model.select_iac[wf, oss] for wf in wf_keys if (wf, oss) in model.viable_iac)
-        return connected_wf_capacity <= sum(model.wf_cap[wf] for wf in wf_keys if model.select_oss[oss] == 1)
-    model.oss_capacity_constraint = Constraint(oss_keys, rule=oss_capacity_rule)
+        connected_wf_capacity = model.oss_capacity[oss]
+        return connected_wf_capacity <= sum(model.wf_cap[wf] for wf in oss_to_wf[oss]) * model.select_oss[oss]
+    model.oss_capacity_constraint = Constraint(oss_keys, rule=oss_capacity_constraint_rule)
 
     # Constraint 10: Matching OSS Capacity and Export Cable Combined Capacity
+    total_wf_cap = sum(wf_cap.values())
+    
     def ec_combined_capacity_matching_rule(model, oss):
         # The combined capacity of the export cables connected to an offshore substation should at least match
         # the capacity of the offshore substation. This uses model.oss_capacity, which reflects the total capacity
         # being routed through the offshore substation from connected wind farms.
         oss_capacity = model.oss_capacity[oss]  # Assuming model.oss_capacity[oss] has been defined as the OSS's capacity
-        oss_connected_ec_capacity = sum(model.wf_cap[wf] * model.select_ec[oss, onss] for onss in onss_keys for wf in wf_keys if (oss, onss) in model.viable_ec)
+        oss_connected_ec_capacity = total_wf_cap * quicksum(model.select_ec[oss, onss] for onss in oss_to_onss[oss])
         return oss_connected_ec_capacity >= oss_capacity
     model.ec_combined_capacity_matching = Constraint(oss_keys, rule=ec_combined_capacity_matching_rule)
 
+    # Constraint 11: The capacity of an offshore substation is transmitted through its export cables
+    def ec_flow_balance_rule(model, oss):
+        if not oss_to_wf[oss] and not oss_to_onss[oss]:
+            return Constraint.Skip
+        return quicksum(model.ec_flow[oss, onss] for onss in oss_to_onss[oss]) == model.oss_capacity[oss]
+    model.ec_flow_balance = Constraint(oss_keys, rule=ec_flow_balance_rule)
+
+    # Constraint 12: Capacity can only be transmitted through selected export cables
+    def ec_flow_select_rule(model, oss, onss):
+        return model.ec_flow[oss, onss] <= oss_max_cap[oss_index[oss]] * model.select_ec[oss, onss]
+    model.ec_flow_select = Constraint(model.viable_ec, rule=ec_flow_select_rule)
+
 
     return model
 
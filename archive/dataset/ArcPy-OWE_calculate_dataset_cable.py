@@ -1,4 +1,20 @@
 import numpy as np
+from functools import lru_cache
+
+# Define years for installation, operational, and decommissioning
+INST_YEAR = 0  # First year
+OPE_YEAR = INST_YEAR + 5
+DEC_YEAR = OPE_YEAR + 25
+END_YEAR = DEC_YEAR + 2  # End year
+
+# Discount rate
+DISCOUNT_RATE = 0.05
+
+# Discount factor for each year from INST_YEAR up to and including END_YEAR
+DISCOUNT_FACTORS = (1 + DISCOUNT_RATE) ** -np.arange(INST_YEAR, END_YEAR + 1)
+
+# Combined discount factor of the yearly operational costs
+OPE_DISCOUNT_FACTOR = DISCOUNT_FACTORS[OPE_YEAR - INST_YEAR:DEC_YEAR - INST_YEAR].sum()
 
 def present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs):
     """
@@ -13,36 +29,11 @@ def present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs):
     Returns:
         tuple: A tuple containing the equipment costs, installation costs, and total present value of costs.
     """
-    # Define years for installation, operational, and decommissioning
-    inst_year = 0  # First year
-    ope_year = inst_year + 5
-    dec_year = ope_year + 25  
-    end_year = dec_year + 2  # End year
-
-    # Discount rate
-    discount_rate = 0.05
-
-    # Define the years as a function of inst_year and end_year
-    years = range(inst_year, end_year + 1)
-
-    # Initialize total operational costs
-    ope_costs = 0
-    
-    # Adjust costs for each year
-    for year in years:
-        # Adjust installation costs
-        if year == inst_year:
-            equip_costs *= (1 + discount_rate) ** -year
-            inst_costs *= (1 + discount_rate) ** -year
-        # Adjust operational costs
-        if year >= inst_year and year < ope_year:
-            inst_costs *= (1 + discount_rate) ** -year
-        elif year >= ope_year and year < dec_year:
-            ope_costs_yearly *= (1 + discount_rate) ** -year
-            ope_costs += ope_costs_yearly  # Accumulate yearly operational costs
-        # Adjust decommissioning costs
-        if year >= dec_year and year <= end_year:
-            deco_costs *= (1 + discount_rate) ** -year
+    # Discount costs to the year in which they are incurred
+    equip_costs *= DISCOUNT_FACTORS[0]
+    inst_costs *= DISCOUNT_FACTORS[0]
+    ope_costs = ope_costs_yearly * OPE_DISCOUNT_FACTOR
+    deco_costs *= DISCOUNT_FACTORS[DEC_YEAR - INST_YEAR]
 
     # Calculate total present value of costs
     total_costs = equip_costs + inst_costs + ope_costs + deco_costs
@@ -75,6 +66,34 @@ def haversine_distance(lon1, lat1, lon2, lat2):
 
     return distance
 
+# Scaling factors for each column of the interarray cable data:
+"""
+Voltage (kV) > (V)
+Section (mm^2)
+Resistance (Ω/km) > (Ω/m)
+Capacity (MW)
+Equipment cost dynamic cables (floating support) (eu/m)
+Equipment cost static cables (static support) (eu/m)
+Installation cost (eu/m)
+"""
+HVAC_INTERARRAY_SCALING_FACTORS = np.array([1e3, 1, 1e-3, 1, 1, 1, 1])
+
+# Interarray cable data where each column represents (tension, section, resistance, capacity, dynamic cost, static cost, inst_cost)
+HVAC_INTERARRAY_CABLE_DATA = np.array([
+    (66, 95, 0.25, 24, 180, 113, 113),
+    (66, 150, 0.16, 30, 215, 134, 121),
+    (66, 300, 0.08, 42, 298, 186, 149),
+    (66, 400, 0.06, 49, 357, 223, 156),
+    (66, 630, 0.04, 59, 456, 285, 171),
+    (66, 800, 0.03, 69, 577, 361, 180),
+    (132, 120, 0.2, 80, 288, 152, 114),
+    (132, 150, 0.16, 87, 358, 188, 122),
+    (132, 300, 0.08, 123, 747, 393, 216),
+    (132, 400, 0.06, 136, 900, 474, 213),
+    (132, 630, 0.04, 162, 1228, 646, 226),
+    (132, 800, 0.03, 201, 1779, 936, 281)
+], dtype=np.float64) * HVAC_INTERARRAY_SCALING_FACTORS
+
 def HVAC_interarray_cable_costs(distance, desired_capacity, desired_voltage, water_depth):
     """
     Calculate the costs associated with selecting HVAC interarray cables for a given distance, desired capacity, desired voltage, and water depth.
@@ -90,41 +109,8 @@ def HVAC_interarray_cable_costs(distance, desired_capacity, desired_voltage, wat
     """
     length = 1.1 * distance
     
-    cable_data = [
-        (66, 95, 0.25, 24, 180, 113, 113),
-        (66, 150, 0.16, 30, 215, 134, 121),
-        (66, 300, 0.08, 42, 298, 186, 149),
-        (66, 400, 0.06, 49, 357, 223, 156),
-        (66, 630, 0.04, 59, 456, 285, 171),
-        (66, 800, 0.03, 69, 577, 361, 180),
-        (132, 120, 0.2, 80, 288, 152, 114),
-        (132, 150, 0.16, 87, 358, 188, 122),
-        (132, 300, 0.08, 123, 747, 393, 216),
-        (132, 400, 0.06, 136, 900, 474, 213),
-        (132, 630, 0.04, 162, 1228, 646, 226),
-        (132, 800, 0.03, 201, 1779, 936, 281)
-    ]
-    
-    # Convert data_tuples to a NumPy array
-    data_array = np.array(cable_data)
-    
     # Filter data based on desired voltage
-    data_array = data_array[data_array[:, 0] == desired_voltage]
-
-    # Define the scaling factors for each column: 
-    """
-    Voltage (kV) > (V)
-    Section (mm^2)
-    Resistance (Ω/km) > (Ω/m)
-    Capacity (MW)
-    Equipment cost dynamic cables (floating support) (eu/m)
-    Equipment cost static cables (static support) (eu/m)
-    Installation cost (eu/m)
-    """
-    scaling_factors = np.array([1e3, 1, 1e-3, 1, 1, 1, 1])
-
-    # Apply scaling to each column in data_array
-    data_array *= scaling_factors
+    data_array = HVAC_INTERARRAY_CABLE_DATA[HVAC_INTERARRAY_CABLE_DATA[:, 0] == desired_voltage * 1e3]
     
     # List to store cable rows and counts
     cable_count = []
@@ -194,6 +180,99 @@ def HVDC_export_cable_costs(distance, desired_capacity):
     
     return total_costs
 
+# Grid frequency (Hz), assumed constant, and the corresponding angular frequency (rad/s)
+FREQUENCY = 50
+OMEGA = 2 * np.pi * FREQUENCY
+
+SQRT_3 = np.sqrt(3)
+
+# Scaling factors for each column of the export cable data:
+"""
+Voltage (kV) > (V)
+Section (mm^2)
+Resistance (mΩ/km) > (Ω/m)
+Capacitance (nF/km) > (F/m)
+Ampacity (A)
+Equipment cost (eu/m)
+Installation cost (eu/m)
+"""
+HVAC_EXPORT_SCALING_FACTORS = np.array([1e3, 1, 1e-6, 1e-12, 1, 1, 1])
+
+# Export cable data where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
+HVAC_EXPORT_CABLE_DATA = np.array([
+    (132, 630, 39.5, 209, 818, 406, 335),
+    (132, 800, 32.4, 217, 888, 560, 340),
+    (132, 1000, 27.5, 238, 949, 727, 350),
+    (220, 500, 48.9, 136, 732, 362, 350),
+    (220, 630, 39.1, 151, 808, 503, 360),
+    (220, 800, 31.9, 163, 879, 691, 370),
+    (220, 1000, 27.0, 177, 942, 920, 380),
+    (400, 800, 31.4, 130, 870, 860, 540),
+    (400, 1000, 26.5, 140, 932, 995, 555),
+    (400, 1200, 22.1, 170, 986, 1130, 570),
+    (400, 1400, 18.9, 180, 1015, 1265, 580),
+    (400, 1600, 16.6, 190, 1036, 1400, 600),
+    (400, 2000, 13.2, 200, 1078, 1535, 615)
+], dtype=np.float64) * HVAC_EXPORT_SCALING_FACTORS
+
+def _hvac_export_cable_core(data_array, length, desired_capacity):
+    """
+    Select the cheapest HVAC export cable configuration from the given (scaled) cable data.
+
+    Parameters:
+        data_array (numpy.ndarray): Scaled cable data, one row per cable type.
+        length (float): The length of the cable route (in meters).
+        desired_capacity (float): The desired capacity of the cable (in watts).
+
+    Returns:
+        tuple: A tuple containing the equipment costs, installation costs, and the sum of both
+                for the selected cable configuration.
+    """
+    voltage, capacitance, ampacity = data_array[:, 0], data_array[:, 3], data_array[:, 4]
+
+    # Reactive power generated by the cable capacitance over its length
+    reactive_power = .5 * voltage**2 * OMEGA * capacitance * length
+
+    # Solve sqrt((sqrt(3) * V * n * I)^2 - Q^2) >= P for the smallest number of cables n
+    n_cables = np.ceil(np.hypot(desired_capacity, reactive_power) / (SQRT_3 * voltage * ampacity))
+    n_cables = np.maximum(n_cables, 1).astype(int)
+
+    # Discard cables that need more than 200 parallel cables to reach the desired capacity
+    valid = n_cables <= 200
+    cables, n_cables = data_array[valid], n_cables[valid]
+
+    # Calculate the total costs for each cable combination
+    total_costs_array = (cables[:, 5] + cables[:, 6]) * length * n_cables
+    
+    # Find the cable combination with the minimum total cost
+    k = int(np.argmin(total_costs_array))
+
+    # Split the costs of the selected combination into equipment and installation costs
+    equip_costs = cables[k, 5] * length * n_cables[k]
+    inst_costs = cables[k, 6] * length * n_cables[k]
+
+    return equip_costs, inst_costs, total_costs_array[k]
+
+@lru_cache(maxsize=4096)
+def _hvac_export_cable_selection(length, desired_capacity, desired_voltage):
+    """
+    Select the cheapest HVAC export cable configuration for a cable route, memoized on its arguments.
+
+    Parameters:
+        length (float): The length of the cable route (in meters).
+        desired_capacity (float): The desired capacity of the cable (in watts).
+        desired_voltage (float): The minimum voltage of the cable (in kilovolts).
+
+    Returns:
+        tuple: A tuple containing the equipment costs and installation costs for the selected cable configuration.
+    """
+    # Filter data based on desired voltage
+    data_array = HVAC_EXPORT_CABLE_DATA[HVAC_EXPORT_CABLE_DATA[:, 0] >= desired_voltage * 1e3]
+
+    equip_costs, inst_costs, _ = _hvac_export_cable_core(data_array, length, desired_capacity)
+
+    return float(equip_costs), float(inst_costs)
+
 def HVAC_export_cable_costs(distance, desired_capacity, desired_voltage):
     """
     Calculate the costs associated with selecting HVAC cables for a given length, desired capacity,
@@ -208,81 +287,14 @@ def HVAC_export_cable_costs(distance, desired_capacity, desired_voltage):
         tuple: A tuple containing the equipment costs, installation costs, and total costs
                 associated with the selected HVAC cables.
     """
-    frequency = 50  # Assuming constant frequency
-    
     length = 1.2 * distance
     
     desired_capacity *= 1e6 # (MW)
-    
-    # Define data_tuples where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
-    cable_data = [
-        (132, 630, 39.5, 209, 818, 406, 335),
-        (132, 800, 32.4, 217, 888, 560, 340),
-        (132, 1000, 27.5, 238, 949, 727, 350),
-        (220, 500, 48.9, 136, 732, 362, 350),
-        (220, 630, 39.1, 151, 808, 503, 360),
-        (220, 800, 31.9, 163, 879, 691, 370),
-        (220, 1000, 27.0, 177, 942, 920, 380),
-        (400, 800, 31.4, 130, 870, 860, 540),
-        (400, 1000, 26.5, 140, 932, 995, 555),
-        (400, 1200, 22.1, 170, 986, 1130, 570),
-        (400, 1400, 18.9, 180, 1015, 1265, 580),
-        (400, 1600, 16.6, 190, 1036, 1400, 600),
-        (400, 2000, 13.2, 200, 1078, 1535, 615)
-    ]
-
-    # Convert data_tuples to a NumPy array
-    data_array = np.array(cable_data)
-    
-    # Filter data based on desired voltage
-    data_array = data_array[data_array[:, 0] >= desired_voltage]
 
-    # Define the scaling factors for each column: 
-    """
-    Voltage (kV) > (V)
-    Section (mm^2)
-    Resistance (mΩ/km) > (Ω/m)
-    Capacitance (nF/km) > (F/m)
-    Ampacity (A)
-    Equipment cost (eu/m)
-    Installation cost (eu/m)
-    """
-    scaling_factors = np.array([1e3, 1, 1e-6, 1e-12, 1, 1, 1])
-
-    # Apply scaling to each column in data_array
-    data_array *= scaling_factors
-
-    # List to store cable rows and counts
-    cable_count = []
-
-    # Iterate over each row (cable)
-    for cable in data_array:
-        n_cables = 1  # Initialize number of cables for this row
-        # Calculate total capacity for this row with increasing number of cables until desired capacity is reached
-        while True:
-            voltage, capacitance, ampacity = cable[0], cable[3], cable[4]
-            calculated_capacity = np.sqrt(max(0, ((np.sqrt(3) * voltage * n_cables * ampacity) ** 2 - (.5 * voltage**2 * 2*np.pi * frequency * capacitance * length) ** 2)))
-            if calculated_capacity >= desired_capacity:
-                # Add the current row index and number of cables to valid_combinations
-                cable_count.append((cable, n_cables))
-                break  # Exit the loop since desired capacity is reached
-            elif n_cables > 200:  # If the number of cables exceeds 200, break the loop
-                break
-            n_cables += 1
-
-    # Calculate the total costs for each cable combination
-    equip_costs_array = [(cable[5] * length * n_cables) for cable, n_cables in cable_count]
-    inst_costs_array = [(cable[6] * length * n_cables) for cable, n_cables in cable_count]
-    
-    # Calculate total costs
-    total_costs_array = np.add(equip_costs_array, inst_costs_array)
-    
-    # Find the cable combination with the minimum total cost
-    min_cost_index = np.argmin(total_costs_array)
+    # Select the cheapest cable configuration, repeated routes are served from the cache
+    equip_costs, inst_costs = _hvac_export_cable_selection(float(length), float(desired_capacity), float(desired_voltage))
 
     # Initialize costs
-    equip_costs = equip_costs_array[min_cost_index]
-    inst_costs = inst_costs_array[min_cost_index]
     ope_costs_yearly = 0.2 * 1e-2 * equip_costs
     deco_costs = 0.5 * inst_costs
     
@@ -292,21 +304,17 @@ def HVAC_export_cable_costs(distance, desired_capacity, desired_voltage):
     return total_costs
 
 
+if __name__ == "__main__":
+    distance = haversine_distance(lon1, lat1, lon2, lat2)
 
+    desired_capacity = 800
+    desired_voltage = 220
+    water_depth = 100
 
-distance = haversine_distance(lon1, lat1, lon2, lat2)
-
-desired_capacity = 800
-desired_voltage = 220
-water_depth = 100
-
-total_costs_HVAC_export = HVAC_export_cable_costs(distance, desired_capacity, desired_voltage)
-total_costs_HVDC_export = HVDC_export_cable_costs(distance, desired_capacity)
-total_costs_HVAC_ia = HVAC_interarray_cable_costs(distance, desired_capacity, desired_voltage, water_depth)
-
-
-
-print(round(total_costs_HVAC_export, 3))
-print(round(total_costs_HVDC_export, 3))
-print(round(total_costs_HVAC_ia, 3))
+    total_costs_HVAC_export = HVAC_export_cable_costs(distance, desired_capacity, desired_voltage)
+    total_costs_HVDC_export = HVDC_export_cable_costs(distance, desired_capacity)
+    total_costs_HVAC_ia = HVAC_interarray_cable_costs(distance, desired_capacity, desired_voltage, water_depth)
 
+    print(round(total_costs_HVAC_export, 3))
+    print(round(total_costs_HVDC_export, 3))
+    print(round(total_costs_HVAC_ia, 3))
@@ -38,9 +38,30 @@ wind farms, offshore substations, and connections between them, adhering to defi
 """
 
 from pyomo.environ import *
+from pyomo.core.expr.numeric_expr import LinearExpression
 import numpy as np
 import os
-from itertools import product
+from itertools import chain
+from collections import defaultdict
+from scipy.spatial import cKDTree
+
+# Define years for installation, operational, and decommissioning
+INST_YEAR = 0  # First year
+OPE_YEAR = INST_YEAR + 5
+DEC_YEAR = OPE_YEAR + 25
+END_YEAR = DEC_YEAR + 2  # End year
+
+# Discount rate
+DISCOUNT_RATE = 0.05
+
+# Sum of the discount factors over the operational years [OPE_YEAR, DEC_YEAR) as a geometric series
+OPE_DISCOUNT = ((1 + DISCOUNT_RATE) ** -OPE_YEAR - (1 + DISCOUNT_RATE) ** -DEC_YEAR) / (DISCOUNT_RATE / (1 + DISCOUNT_RATE))
+
+# Decommissioning costs are incurred once, discounted to the decommissioning year
+DECO_DISCOUNT = (1 + DISCOUNT_RATE) ** -DEC_YEAR
+
+# Equipment and installation costs are incurred in the installation year
+INST_DISCOUNT = (1 + DISCOUNT_RATE) ** -INST_YEAR
 
 def present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs):
     """
@@ -53,76 +74,39 @@ def present_value(equip_costs, inst_costs, ope_costs_yearly, deco_costs):
         deco_costs (float): Decommissioning costs.
 
     Returns:
-        tuple: A tuple containing the equipment costs, installation costs, and total present value of costs.
+        float: Total present value of costs.
     """
-    # Define years for installation, operational, and decommissioning
-    inst_year = 0  # First year
-    ope_year = inst_year + 5
-    dec_year = ope_year + 25  
-    end_year = dec_year + 2  # End year
-
-    # Discount rate
-    discount_rate = 0.05
-
-    # Define the years as a function of inst_year and end_year
-    years = range(inst_year, end_year + 1)
-
-    # Initialize total operational costs
-    ope_costs = 0
-    
-    # Adjust costs for each year
-    for year in years:
-        # Adjust installation costs
-        if year == inst_year:
-            equip_costs *= (1 + discount_rate) ** -year
-            inst_costs *= (1 + discount_rate) ** -year
-        # Adjust operational costs
-        if year >= inst_year and year < ope_year:
-            inst_costs *= (1 + discount_rate) ** -year
-        elif year >= ope_year and year < dec_year:
-            ope_costs_yearly *= (1 + discount_rate) ** -year
-            ope_costs += ope_costs_yearly  # Accumulate yearly operational costs
-        # Adjust decommissioning costs
-        if year >= dec_year and year <= end_year:
-            deco_costs *= (1 + discount_rate) ** -year
-
     # Calculate total present value of costs
-    total_costs = equip_costs + inst_costs + ope_costs + deco_costs
+    total_costs = (equip_costs + inst_costs) * INST_DISCOUNT + ope_costs_yearly * OPE_DISCOUNT + deco_costs * DECO_DISCOUNT
 
     return total_costs
 
-def haversine_distance_scalar(lon1, lat1, lon2, lat2):
-    """
-    Calculate the Haversine distance between two sets of coordinates.
-
-    Parameters:
-        lon1 (float): Longitude of the first coordinate.
-        lat1 (float): Latitude of the first coordinate.
-        lon2 (float): Longitude of the second coordinate.
-        lat2 (float): Latitude of the second coordinate.
-
-    Returns:
-        float: Haversine distance in meters.
-    """
-    # Radius of the Earth in meters
-    r = 6371 * 1e3
-    
-    # Convert latitude and longitude from degrees to radians
-    lon1, lat1, lon2, lat2 = np.radians(lon1), np.radians(lat1), np.radians(lon2), np.radians(lat2)
-
-    # Calculate differences in coordinates
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-
-    # Apply Haversine formula
-    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
-    c = 2 * np.arcsin(np.sqrt(a))
-
-    # Calculate the distance
-    distance = c * r 
-
-    return distance
-
+# Export cable data where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
+"""
+Each column is scaled on load:
+Voltage (kV) > (V)
+Section (mm^2) > (m^2)
+Resistance (mΩ/km) > (Ω/m)
+Capacitance (nF/km) > (F/m)
+Ampacity (A)
+Equipment cost (eu/m)
+Installation cost (eu/m)
+"""
+EXPORT_CABLE_DATA = np.array([
+    (132, 630, 39.5, 209, 818, 406, 335),
+    (132, 800, 32.4, 217, 888, 560, 340),
+    (132, 1000, 27.5, 238, 949, 727, 350),
+    (220, 500, 48.9, 136, 732, 362, 350),
+    (220, 630, 39.1, 151, 808, 503, 360),
+    (220, 800, 31.9, 163, 879, 691, 370),
+    (220, 1000, 27.0, 177, 942, 920, 380),
+    (400, 800, 31.4, 130, 870, 860, 540),
+    (400, 1000, 26.5, 140, 932, 995, 555),
+    (400, 1200, 22.1, 170, 986, 1130, 570),
+    (400, 1400, 18.9, 180, 1015, 1265, 580),
+    (400, 1600, 16.6, 190, 1036, 1400, 600),
+    (400, 2000, 13.2, 200, 1078, 1535, 615)
+], dtype=np.float64) * np.array([1e3, 1e-6, 1e-6, 1e-12, 1, 1, 1])
 
 def export_cable_costs(distance, required_active_power, polarity="AC"):
     """
@@ -138,90 +122,35 @@ def export_cable_costs(distance, required_active_power, polarity="AC"):
         tuple: A tuple containing the equipment costs, installation costs, and total costs
                 associated with the selected HVAC cables.
     """
-
-    from pyomo.environ import Ceiling, minimize
-    
     length = 1.2 * distance
 
     required_active_power *= 1e6  # (MW > W)
     required_voltage = 400
 
-    # Define data_tuples where each column represents (tension, section, resistance, capacitance, ampacity, cost, inst_cost)
-    cable_data = [
-        (132, 630, 39.5, 209, 818, 406, 335),
-        (132, 800, 32.4, 217, 888, 560, 340),
-        (132, 1000, 27.5, 238, 949, 727, 350),
-        (220, 500, 48.9, 136, 732, 362, 350),
-        (220, 630, 39.1, 151, 808, 503, 360),
-        (220, 800, 31.9, 163, 879, 691, 370),
-        (220, 1000, 27.0, 177, 942, 920, 380),
-        (400, 800, 31.4, 130, 870, 860, 540),
-        (400, 1000, 26.5, 140, 932, 995, 555),
-        (400, 1200, 22.1, 170, 986, 1130, 570),
-        (400, 1400, 18.9, 180, 1015, 1265, 580),
-        (400, 1600, 16.6, 190, 1036, 1400, 600),
-        (400, 2000, 13.2, 200, 1078, 1535, 615)
-    ]
-
     # Filter data based on desired voltage
-    cable_data = [cable for cable in cable_data if cable[0] >= required_voltage]
-
-    # Define the scaling factors for each column:
-    """
-    Voltage (kV) > (V)
-    Section (mm^2) > (m^2)
-    Resistance (mΩ/km) > (Ω/m)
-    Capacitance (nF/km) > (F/m)
-    Ampacity (A)
-    Equipment cost (eu/m)
-    Installation cost (eu/m)
-    """
-    scaling_factors = [1e3, 1e-6, 1e-6, 1e-12, 1, 1, 1]
-
-    # Apply scaling to each column in cable_data
-    scaled_cable_data = []
-    for cable in cable_data:
-        scaled_cable = [cable[i] * scaling_factors[i] for i in range(len(cable))]
-        scaled_cable_data.append(scaled_cable)
+    cables = EXPORT_CABLE_DATA[EXPORT_CABLE_DATA[:, 0] >= required_voltage * 1e3]
 
     power_factor = 0.90
-    cable_count = []  # To store the number of cables and corresponding cable data
-
-    for cable in scaled_cable_data:
-        voltage, resistance, capacitance, ampacity = cable[0], cable[2], cable[3], cable[4]
-        nominal_power_per_cable = voltage * ampacity
-        if polarity == "AC":  # Three phase AC
-            ac_apparent_power = required_active_power / power_factor
-            # Determine number of cables needed based on required total apparent power
-            n_cables = Ceiling(ac_apparent_power / nominal_power_per_cable)
-
-            current = ac_apparent_power / voltage
-
-        else:  # Assuming polarity == "DC"
-            # Determine number of cables needed based on required power
-            n_cables = Ceiling(required_active_power / nominal_power_per_cable)
-
-            current = required_active_power / voltage
 
-        resistive_losses = current ** 2 * resistance * length / n_cables
-        power_eff = (resistive_losses / required_active_power)
+    # Nominal power per cable
+    nominal_power_per_cable = cables[:, 0] * cables[:, 4]
 
-        # Add the calculated data to the list
-        cable_count.append((cable, n_cables))
+    if polarity == "AC":  # Three phase AC
+        # Determine number of cables needed based on required total apparent power
+        n_cables = np.ceil((required_active_power / power_factor) / nominal_power_per_cable)
+    else:  # Assuming polarity == "DC"
+        # Determine number of cables needed based on required power
+        n_cables = np.ceil(required_active_power / nominal_power_per_cable)
 
     # Calculate the total costs for each cable combination
-    equip_costs_array = [cable[5] * length * n_cables for cable, n_cables in cable_count]
-    inst_costs_array = [cable[6] * length * n_cables for cable, n_cables in cable_count]
-
-    # Calculate total costs
-    total_costs_array = [equip + inst for equip, inst in zip(equip_costs_array, inst_costs_array)]
+    total_costs_array = (cables[:, 5] + cables[:, 6]) * length * n_cables
 
     # Find the cable combination with the minimum total cost
-    min_cost_index = total_costs_array.index(min(total_costs_array))
+    min_cost_index = np.argmin(total_costs_array)
 
     # Initialize costs
-    equip_costs = equip_costs_array[min_cost_index]
-    inst_costs = inst_costs_array[min_cost_index]
+    equip_costs = cables[min_cost_index, 5] * length * n_cables[min_cost_index]
+    inst_costs = cables[min_cost_index, 6] * length * n_cables[min_cost_index]
     ope_costs_yearly = 0.2 * 1e-2 * equip_costs
     deco_costs = 0.5 * inst_costs
 
@@ -321,7 +250,7 @@ def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacit
         # Installation coefficients for different vehicles
         inst_coeff = {
             ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
+            ('jacket', 'PSIV'): (1, 18.5, 24, 96, 200),
             ('floating','HLCV'): (1, 22.5, 10, 0, 40),
             ('floating','AHV'): (3, 18.5, 30, 90, 40)
         }
@@ -329,7 +258,7 @@ def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacit
         # Decommissioning coefficients for different vehicles
         deco_coeff = {
             ('sandisland','SUBV'): (20000, 25, 2000, 6000, 15),
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
+            ('jacket', 'PSIV'): (1, 18.5, 24, 96, 200),
             ('floating','HLCV'): (1, 22.5, 10, 0, 40),
             ('floating','AHV'): (3, 18.5, 30, 30, 40)
         }
@@ -353,7 +282,7 @@ def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacit
             total_costs = ((volume_island / c1) * ((2 * port_distance) / c2) + (volume_island / c3) + (volume_island / c4)) * (c5 * 1000) / 24
             
         elif support_structure == 'jacket':
-            c1, c2, c3, c4, c5 = coeff[('jacket' 'PSIV')]
+            c1, c2, c3, c4, c5 = coeff[('jacket', 'PSIV')]
             # Calculate installation costs for jacket
             total_costs = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
         elif support_structure == 'floating':
@@ -395,7 +324,7 @@ def offshore_substation_costs(water_depth, ice_cover, port_distance, oss_capacit
     
     return oss_costs
 
-def save_results(model, workspace_folder):
+def save_results(model, workspace_folder, data):
     """
     Save selected components and their attributes from the optimization model to .npy and .txt files as structured arrays.
 
@@ -406,6 +335,7 @@ def save_results(model, workspace_folder):
     Parameters:
     - model (ConcreteModel): The optimized Pyomo ConcreteModel containing the results.
     - workspace_folder (str): Path to the directory where output files will be saved.
+    - data (dict): Fixed component data indexed by ID, keyed by attribute name (e.g., 'wf_lon').
 
     Each component's data is saved in a separate file named according to the component type (e.g., 'wf_data.npy' for wind farms).
     """
@@ -431,13 +361,13 @@ def save_results(model, workspace_folder):
         'iac': {
             'var': model.select_iac_var,
             'ids': model.viable_iac_ids,
-            'data': ['iac_dist_exp', 'iac_cap_exp', 'iac_cost_exp'],
+            'data': ['iac_dist', 'iac_cap', 'iac_cost'],
             'dtype': [('wf_id', 'i4'), ('oss_id', 'i4'), ('dist', 'f8'), ('cap', 'i4'), ('cost', 'f8')]
         },
         'ec': {
             'var': model.select_ec_var,
             'ids': model.viable_ec_ids,
-            'data': ['ec_dist_exp', 'ec_cap_exp', 'ec_cost_exp'],
+            'data': ['ec_dist', 'ec_cap_exp', 'ec_cost_exp'],
             'dtype': [('oss_id', 'i4'), ('onss_id', 'i4'), ('dist', 'f8'), ('cap', 'i4'), ('cost', 'f8')]
         }
     }
@@ -448,7 +378,7 @@ def save_results(model, workspace_folder):
         for idx in selected_ids:
             item_data = (idx if isinstance(idx, tuple) else (idx,))
             for param_name in details['data']:
-                param = getattr(model, param_name)
+                param = data[param_name] if param_name in data else getattr(model, param_name)
                 item_data += (param[idx].value if hasattr(param[idx], 'value') else param[idx],)
             data_to_save.append(item_data)
 
@@ -475,16 +405,36 @@ def oss_cost_plh(wdepth, icover, pdist, capacity, polarity):
     Returns:
     - cost (float): Total cost of the offshore substation.
     """
+    fixed_cost, capacity_cost = oss_cost_plh_coeffs(wdepth, icover, pdist, polarity)
+
+    return fixed_cost + capacity_cost * capacity
+
+def oss_cost_plh_coeffs(wdepth, icover, pdist, polarity):
+    """
+    Placeholder function to calculate the capacity independent and the per capacity offshore substation costs.
+
+    Parameters:
+    - wdepth (float): Water depth.
+    - icover (int): Ice cover (binary: 0 for no ice, 1 for ice).
+    - pdist (float): Distance to port.
+    - polarity (str): Polarity of the cost calculation.
+
+    Returns:
+    - tuple: Fixed cost and cost per unit of capacity of the offshore substation.
+    """
     # Example cost calculation
-    cost = wdepth * 1000 + icover * 5000 + pdist * 2000 + capacity * 1000
+    fixed_cost = wdepth * 1000 + icover * 5000 + pdist * 2000
+    capacity_cost = 1000
     
     # Polarity adjustment
     if polarity == "AC":
-        cost *= 1.1  # Example adjustment for AC costs
+        adjustment = 1.1  # Example adjustment for AC costs
     elif polarity == "DC":
-        cost *= 1.2  # Example adjustment for DC costs
+        adjustment = 1.2  # Example adjustment for DC costs
+    else:
+        adjustment = 1
     
-    return cost
+    return fixed_cost * adjustment, capacity_cost * adjustment
 
 def iac_cost_plh(distance, capacity, polarity):
     """
@@ -552,10 +502,19 @@ def onss_cost_plh(capacity, threshold):
     
     return cost_function_max
 
+# Radius of the Earth in kilometers
+EARTH_RADIUS = 6371
+
 def haversine(lon1, lat1, lon2, lat2):
     """
     Calculate the great-circle distance between two points
     on the Earth (specified in decimal degrees) using NumPy for calculations.
+
+    Parameters:
+    - lon1, lat1, lon2, lat2 (float or numpy.ndarray): Coordinates in decimal degrees, arrays are broadcast.
+
+    Returns:
+    - float or numpy.ndarray: Distance in kilometers.
     """
     # Convert decimal degrees to radians
     lon1, lat1, lon2, lat2 = map(np.radians, [lon1, lat1, lon2, lat2])
@@ -565,42 +524,139 @@ def haversine(lon1, lat1, lon2, lat2):
     dlat = lat2 - lat1
     a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
     c = 2 * np.arcsin(np.sqrt(a))
-    r = 6371  # Radius of Earth in kilometers
-    return c * r
+    return c * EARTH_RADIUS
+
+def unit_vectors(lon, lat, cos_lat):
+    """
+    Convert coordinates in radians to 3D unit vectors on the sphere.
+
+    Parameters:
+    - lon, lat (numpy.ndarray): Coordinates in radians.
+    - cos_lat (numpy.ndarray): Cosine of the latitudes.
 
-def find_viable_iac(wf_lon, wf_lat, oss_lon, oss_lat, wf_iso, oss_iso):
+    Returns:
+    - numpy.ndarray: Array of shape (n, 3) with the Cartesian coordinates.
+    """
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+def pairs_within_distance(lon1, lat1, lon2, lat2, max_distance):
+    """
+    Find all pairs of points from two sets whose great-circle distance does not exceed a maximum distance,
+    using KD-trees on the unit sphere so only nearby pairs are evaluated.
+
+    Parameters:
+    - lon1, lat1 (numpy.ndarray): Coordinates of the first set in decimal degrees.
+    - lon2, lat2 (numpy.ndarray): Coordinates of the second set in decimal degrees.
+    - max_distance (float): Maximum distance in km.
+
+    Returns:
+    - tuple: Row indices into the first set, row indices into the second set, and the distances in km of the pairs.
+    """
+    # Chord length on the unit sphere corresponding to the maximum great-circle distance, with a small margin
+    chord = 2 * np.sin(max_distance / (2 * EARTH_RADIUS)) * (1 + 1e-9)
+
+    # Convert to radians and take the cosine of the latitudes once per point instead of once per pair
+    lon1, lat1, lon2, lat2 = map(np.radians, [lon1, lat1, lon2, lat2])
+    cos_lat1, cos_lat2 = np.cos(lat1), np.cos(lat2)
+
+    tree1 = cKDTree(unit_vectors(lon1, lat1, cos_lat1))
+    tree2 = cKDTree(unit_vectors(lon2, lat2, cos_lat2))
+    neighbours = tree1.query_ball_tree(tree2, r=chord)
+
+    rows1 = np.repeat(np.arange(len(neighbours)), [len(n) for n in neighbours])
+    rows2 = np.fromiter(chain.from_iterable(neighbours), dtype=np.int64, count=len(rows1))
+
+    # Calculate the exact distance of the candidate pairs and keep the pairs within the maximum distance
+    dlon = lon2[rows2] - lon1[rows1]
+    dlat = lat2[rows2] - lat1[rows1]
+    a = np.sin(dlat/2.0)**2 + cos_lat1[rows1] * cos_lat2[rows2] * np.sin(dlon/2.0)**2
+    distances = 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS
+    within = distances <= max_distance
+
+    return rows1[within], rows2[within], distances[within]
+
+def find_viable_iac(wf_ids, oss_ids, wf_lon, wf_lat, oss_lon, oss_lat, wf_iso, oss_iso):
     """
     Find all pairs of offshore wind farms and offshore substations within 150km,
     ensuring that they belong to the same country based on their ISO codes.
     
-    Parameters are dictionaries indexed by IDs with longitude, latitude, and ISO codes.
+    Parameters are arrays of IDs and the longitude, latitude, and ISO codes aligned with them.
+
+    Returns:
+    - dict: Distance in km of each viable connection, keyed by (wf_id, oss_id).
     """
-    connections = []
-    for wf_id, oss_id in product(wf_lon.keys(), oss_lon.keys()):
-        # Calculate the distance first to see if they are within the viable range
-        distance = haversine(wf_lon[wf_id], wf_lat[wf_id], oss_lon[oss_id], oss_lat[oss_id])
-        if distance <= 150:  # Check if the distance is within 150 km
-            # Then check if the ISO codes match for the current wind farm and offshore substation pair
-            if wf_iso[wf_id] == 6: #oss_iso[oss_id]:
-                connections.append((int(wf_id), int(oss_id)))
-    return connections
-
-def find_viable_ec(oss_lon, oss_lat, onss_lon, onss_lat, oss_iso, onss_iso):
+    # Check if the ISO codes match for the wind farm and offshore substation pair
+    wf_rows = np.flatnonzero(wf_iso == 6) #oss_iso
+
+    # Find the pairs within the viable range of 150 km
+    i, j, distances = pairs_within_distance(wf_lon[wf_rows], wf_lat[wf_rows], oss_lon, oss_lat, 150)
+
+    pairs = zip(wf_ids[wf_rows][i].tolist(), oss_ids[j].tolist())
+
+    return dict(zip(pairs, distances.tolist()))
+
+def find_viable_ec(oss_ids, onss_ids, oss_lon, oss_lat, onss_lon, onss_lat, oss_iso, onss_iso):
     """
     Find all pairs of offshore and onshore substations within 300km,
     ensuring that they belong to the same country based on their ISO codes.
     
-    Parameters are dictionaries indexed by substation IDs with longitude, latitude, and ISO codes.
+    Parameters are arrays of substation IDs and the longitude, latitude, and ISO codes aligned with them.
+
+    Returns:
+    - dict: Distance in km of each viable connection, keyed by (oss_id, onss_id).
+    """
+    # Check if the ISO codes match for the offshore and onshore substation pair
+    oss_rows = np.flatnonzero(oss_iso == 6) #onss_iso
+
+    # Find the pairs within the viable range of 300 km
+    i, j, distances = pairs_within_distance(oss_lon[oss_rows], oss_lat[oss_rows], onss_lon, onss_lat, 300)
+
+    pairs = zip(oss_ids[oss_rows][i].tolist(), onss_ids[j].tolist())
+
+    return dict(zip(pairs, distances.tolist()))
+
+def load_dataset(dataset_file):
+    """
+    Load a dataset from a .npy file, memory-mapped so only the columns that are used are read from disk.
+
+    Parameters:
+    - dataset_file (str): Path to the .npy dataset file.
+
+    Returns:
+    - numpy.ndarray: The loaded dataset.
+    """
+    try:
+        return np.load(dataset_file, mmap_mode='r')
+    except ValueError:
+        # Datasets holding Python objects can not be memory-mapped and are unpickled instead
+        return np.load(dataset_file, allow_pickle=True)
+
+def dataset_column(dataset, index):
+    """
+    Get a column of a loaded dataset by position.
+
+    Parameters:
+    - dataset (numpy.ndarray): Structured array or 2D array as loaded from a .npy dataset file.
+    - index (int): Position of the column.
+
+    Returns:
+    - numpy.ndarray: The column values.
+    """
+    return dataset[dataset.dtype.names[index]] if dataset.dtype.names else dataset[:, index]
+
+def iso_to_int(iso_column, iso_to_int_mp):
+    """
+    Map a column of ISO country codes to their integer codes, looking up each distinct code only once.
+
+    Parameters:
+    - iso_column (numpy.ndarray): ISO country codes.
+    - iso_to_int_mp (dict): Mapping of ISO country codes to integers.
+
+    Returns:
+    - numpy.ndarray: Integer country codes.
     """
-    connections = []
-    for oss_id, onss_id in product(oss_lon.keys(), onss_lon.keys()):
-        # Calculate the distance first to see if they are within the viable range
-        distance = haversine(oss_lon[oss_id], oss_lat[oss_id], onss_lon[onss_id], onss_lat[onss_id])
-        if distance <= 300:  # Check if the distance is within 300 km
-            # Then check if the ISO codes match for the current offshore and onshore substation pair
-            if oss_iso[oss_id] == 6: #onss_iso[onss_id]:
-                connections.append((int(oss_id), int(onss_id)))
-    return connections
+    isos, inverse = np.unique(iso_column.astype(str), return_inverse=True)
+    return np.array([iso_to_int_mp[iso] for iso in isos], dtype=np.int64)[inverse]
 
 def get_viable_entities(viable_iac, viable_ec):
     """
@@ -608,10 +664,10 @@ def get_viable_entities(viable_iac, viable_ec):
     based on their involvement in viable inter-array and export cable connections.
 
     Parameters:
-    - viable_iac (list of tuples): List of tuples, each representing a viable connection
-        between a wind farm and an offshore substation (wf_id, oss_id).
-    - viable_ec (list of tuples): List of tuples, each representing a viable connection
-        between an offshore substation and an onshore substation (oss_id, onss_id).
+    - viable_iac (dict): Viable connections between a wind farm and an offshore substation,
+        keyed by (wf_id, oss_id).
+    - viable_ec (dict): Viable connections between an offshore substation and an onshore substation,
+        keyed by (oss_id, onss_id).
 
     Returns:
     - viable_wf (set): Set of wind farm IDs with at least one viable connection to an offshore substation.
@@ -683,47 +739,62 @@ def opt_model(workspace_folder):
     oss_dataset_file = os.path.join(workspace_folder, 'oss_data.npy')
     onss_dataset_file = os.path.join(workspace_folder, 'onss_data.npy')
     
-    wf_dataset = np.load(wf_dataset_file, allow_pickle=True)
-    oss_dataset = np.load(oss_dataset_file, allow_pickle=True)
-    onss_dataset = np.load(onss_dataset_file, allow_pickle=True)
+    wf_dataset = load_dataset(wf_dataset_file)
+    oss_dataset = load_dataset(oss_dataset_file)
+    onss_dataset = load_dataset(onss_dataset_file)
+
+    # Wind farm data as columns
+    wf_ids_arr = dataset_column(wf_dataset, 0).astype(np.int64)
+    wf_iso_arr = iso_to_int(dataset_column(wf_dataset, 1), iso_to_int_mp)
+    wf_lon_arr = dataset_column(wf_dataset, 2).astype(np.float64)
+    wf_lat_arr = dataset_column(wf_dataset, 3).astype(np.float64)
+    wf_cap_arr = dataset_column(wf_dataset, 5).astype(np.float64)
+    wf_cost_arr = dataset_column(wf_dataset, 6).astype(np.float64)
+
+    # Offshore substation data as columns
+    oss_ids_arr = dataset_column(oss_dataset, 0).astype(np.int64)
+    oss_iso_arr = iso_to_int(dataset_column(oss_dataset, 1), iso_to_int_mp)
+    oss_lon_arr = dataset_column(oss_dataset, 2).astype(np.float64)
+    oss_lat_arr = dataset_column(oss_dataset, 3).astype(np.float64)
+    oss_wdepth_arr = dataset_column(oss_dataset, 4).astype(np.int64)
+    oss_icover_arr = dataset_column(oss_dataset, 5).astype(np.int64)
+    oss_pdist_arr = dataset_column(oss_dataset, 6).astype(np.int64)
+
+    # Onshore substation data as columns
+    onss_ids_arr = dataset_column(onss_dataset, 0).astype(np.int64)
+    onss_iso_arr = iso_to_int(dataset_column(onss_dataset, 1), iso_to_int_mp)
+    onss_lon_arr = dataset_column(onss_dataset, 2).astype(np.float64)
+    onss_lat_arr = dataset_column(onss_dataset, 3).astype(np.float64)
+    onss_cthr_arr = dataset_column(onss_dataset, 4).astype(np.int64)
+
+    # The columns above are copies; close the memory-mapped files, save_results overwrites them
+    del wf_dataset, oss_dataset, onss_dataset
 
     # Component identifiers
-    wf_ids = [int(data[0]) for data in wf_dataset]
-    oss_ids = [int(data[0]) for data in oss_dataset]
-    onss_ids = [int(data[0]) for data in onss_dataset]
-
-    # Wind farm data
-    wf_iso, wf_lon, wf_lat, wf_cap, wf_cost = {}, {}, {}, {}, {}
-
-    for data in wf_dataset:
-        id = int(data[0])
-        wf_iso[id] = iso_to_int_mp[data[1]]
-        wf_lon[id] = data[2]
-        wf_lat[id] = data[3]
-        wf_cap[id] = data[5]
-        wf_cost[id] = data[6]
-
-    # Offshore substation data
-    oss_iso, oss_lon, oss_lat, oss_wdepth, oss_icover, oss_pdist = {}, {}, {}, {}, {}, {}
-
-    for data in oss_dataset:
-        id = int(data[0])
-        oss_iso[id] = iso_to_int_mp[data[1]]
-        oss_lon[id] = data[2]
-        oss_lat[id] = data[3]
-        oss_wdepth[id] = data[4]
-        oss_icover[id] = data[5]
-        oss_pdist[id] = data[6]
-    
-    # Onshore substation data
-    onss_iso, onss_lon, onss_lat, onss_cthr = {}, {}, {}, {}
-
-    for data in onss_dataset:
-        id = int(data[0])
-        onss_iso[id] = iso_to_int_mp[data[1]]
-        onss_lon[id] = data[2]
-        onss_lat[id] = data[3]
-        onss_cthr[id] = data[4]
+    wf_ids = wf_ids_arr.tolist()
+    oss_ids = oss_ids_arr.tolist()
+    onss_ids = onss_ids_arr.tolist()
+
+    # Wind farm data indexed by ID
+    wf_iso = dict(zip(wf_ids, wf_iso_arr.tolist()))
+    wf_lon = dict(zip(wf_ids, wf_lon_arr.tolist()))
+    wf_lat = dict(zip(wf_ids, wf_lat_arr.tolist()))
+    wf_cap = dict(zip(wf_ids, wf_cap_arr.tolist()))
+    wf_cost = dict(zip(wf_ids, wf_cost_arr.tolist()))
+
+    # Offshore substation data indexed by ID
+    oss_iso = dict(zip(oss_ids, oss_iso_arr.tolist()))
+    oss_lon = dict(zip(oss_ids, oss_lon_arr.tolist()))
+    oss_lat = dict(zip(oss_ids, oss_lat_arr.tolist()))
+    oss_wdepth = dict(zip(oss_ids, oss_wdepth_arr.tolist()))
+    oss_icover = dict(zip(oss_ids, oss_icover_arr.tolist()))
+    oss_pdist = dict(zip(oss_ids, oss_pdist_arr.tolist()))
+
+    # Onshore substation data indexed by ID
+    onss_iso = dict(zip(onss_ids, onss_iso_arr.tolist()))
+    onss_lon = dict(zip(onss_ids, onss_lon_arr.tolist()))
+    onss_lat = dict(zip(onss_ids, onss_lat_arr.tolist()))
+    onss_cthr = dict(zip(onss_ids, onss_cthr_arr.tolist()))
 
     """
     Define model parameters
@@ -735,38 +806,54 @@ def opt_model(workspace_folder):
     model.oss_ids = Set(initialize=oss_ids)
     model.onss_ids = Set(initialize=onss_ids)
     
-    # Wind farm model parameters
-    model.wf_iso = Param(model.wf_ids, initialize=wf_iso, within=NonNegativeIntegers)
-    model.wf_lon = Param(model.wf_ids, initialize=wf_lon, within=NonNegativeReals)
-    model.wf_lat = Param(model.wf_ids, initialize=wf_lat, within=NonNegativeReals)
-    model.wf_cap = Param(model.wf_ids, initialize=wf_cap, within=NonNegativeIntegers)
-    model.wf_cost = Param(model.wf_ids, initialize=wf_cost, within=NonNegativeIntegers)
-
-    # Offshore substation model parameters
-    model.oss_iso = Param(model.oss_ids, initialize=oss_iso, within=NonNegativeIntegers)
-    model.oss_lon = Param(model.oss_ids, initialize=oss_lon, within=NonNegativeReals)
-    model.oss_lat = Param(model.oss_ids, initialize=oss_lat, within=NonNegativeReals)
-    model.oss_wdepth = Param(model.oss_ids, initialize=oss_wdepth, within=NonNegativeIntegers)
-    model.oss_icover = Param(model.oss_ids, initialize=oss_icover, within=Binary)
-    model.oss_pdist = Param(model.oss_ids, initialize=oss_pdist, within=NonNegativeIntegers)
-
-    # Onshore substation model parameters
-    model.onss_iso = Param(model.onss_ids, initialize=onss_iso, within=NonNegativeIntegers)
-    model.onss_lon = Param(model.onss_ids, initialize=onss_lon, within=NonNegativeReals)
-    model.onss_lat = Param(model.onss_ids, initialize=onss_lat, within=NonNegativeReals)
-    model.onss_cthr = Param(model.onss_ids, initialize=onss_cthr, within=NonNegativeIntegers)
+    # Fixed data of the components, only used as constants in the rules below and kept out of Pyomo Params
+    data = {
+        'wf_iso': wf_iso, 'wf_lon': wf_lon, 'wf_lat': wf_lat, 'wf_cap': wf_cap, 'wf_cost': wf_cost,
+        'oss_iso': oss_iso, 'oss_lon': oss_lon, 'oss_lat': oss_lat, 'oss_wdepth': oss_wdepth, 'oss_icover': oss_icover, 'oss_pdist': oss_pdist,
+        'onss_iso': onss_iso, 'onss_lon': onss_lon, 'onss_lat': onss_lat, 'onss_cthr': onss_cthr
+    }
 
     """
     Define decision variables
     """
     print("Defining decision parameters...")
     
-    # Calculate viable connections
-    viable_iac = find_viable_iac(wf_lon, wf_lat, oss_lon, oss_lat, wf_iso, oss_iso)
-    viable_ec = find_viable_ec(oss_lon, oss_lat, onss_lon, onss_lat, oss_iso, onss_iso)
+    # Calculate viable connections and their distances
+    iac_dist = find_viable_iac(wf_ids_arr, oss_ids_arr, wf_lon_arr, wf_lat_arr, oss_lon_arr, oss_lat_arr, wf_iso_arr, oss_iso_arr)
+    ec_dist = find_viable_ec(oss_ids_arr, onss_ids_arr, oss_lon_arr, oss_lat_arr, onss_lon_arr, onss_lat_arr, oss_iso_arr, onss_iso_arr)
+
+    viable_iac = list(iac_dist)
+    viable_ec = list(ec_dist)
 
     model.viable_iac_ids = Set(initialize= viable_iac, dimen=2)
     model.viable_ec_ids = Set(initialize= viable_ec, dimen=2)
+
+    # Neighbouring components that can be connected to each wind farm, offshore and onshore substation
+    oss_to_wfs, wf_to_osss, onss_to_osss = defaultdict(list), defaultdict(list), defaultdict(list)
+    for wf, oss in viable_iac:
+        oss_to_wfs[oss].append(wf)
+        wf_to_osss[wf].append(oss)
+    for oss, onss in viable_ec:
+        onss_to_osss[onss].append(oss)
+
+    # Inter-array cable costs only depend on fixed data, so they are calculated once
+    iac_cost = {(wf, oss): iac_cost_plh(dist, wf_cap[wf], polarity = "AC") for (wf, oss), dist in iac_dist.items()}
+
+    # Fixed data of the viable connections, used as constants instead of Expressions
+    data.update({
+        'iac_dist': iac_dist, 'iac_cap': {(wf, oss): wf_cap[wf] for (wf, oss) in viable_iac}, 'iac_cost': iac_cost,
+        'ec_dist': ec_dist
+    })
+
+    # Offshore substation costs split in a fixed part and a part per unit of connected capacity,
+    # calculated once for each distinct combination of water depth, ice cover and port distance
+    oss_keys, oss_inv = np.unique(np.column_stack((oss_wdepth_arr, oss_icover_arr, oss_pdist_arr)), axis=0, return_inverse=True)
+    unique_fixed_cost, unique_capacity_cost = oss_cost_plh_coeffs(oss_keys[:, 0], oss_keys[:, 1], oss_keys[:, 2], polarity = "AC")
+    unique_capacity_cost = np.broadcast_to(unique_capacity_cost, unique_fixed_cost.shape)
+    oss_inv = oss_inv.ravel()
+
+    oss_fixed_cost = dict(zip(oss_ids, unique_fixed_cost[oss_inv].tolist()))
+    oss_capacity_cost = dict(zip(oss_ids, unique_capacity_cost[oss_inv].tolist()))
     
     # Calculate viable entities based on the viable connections
     model.viable_wf_ids, model.viable_oss_ids, model.viable_onss_ids = get_viable_entities(viable_iac, viable_ec)
@@ -795,58 +882,8 @@ def opt_model(workspace_folder):
     """
     Define Expressions
     """
-    print("Defining distance expressions...")
-    
-    def iac_dist_rule(model, wf, oss):
-        """
-        Calculate the geographic distance between a wind farm (WF) and an offshore substation (OSS) using the Haversine formula,
-        only if there is an inter-array cable (IAC) connection.
-
-        Parameters:
-        - model: The Pyomo model object.
-        - wf: Index of the wind farm.
-        - oss: Index of the offshore substation.
-
-        Returns:
-        - The calculated distance multiplied by the binary decision variable indicating if the connection exists.
-        """
-        return haversine(model.wf_lon[wf], model.wf_lat[wf], model.oss_lon[oss], model.oss_lat[oss]) * model.select_iac_var[wf, oss]
-    
-    model.iac_dist_exp = Expression(model.viable_iac_ids, rule=iac_dist_rule)
-
-    def ec_dist_rule(model, oss, onss):
-        """
-        Calculate the geographic distance between an offshore substation (OSS) and an onshore substation (ONSS) using the Haversine formula,
-        only if there is an export cable (EC) connection.
-
-        Parameters:
-        - model: The Pyomo model object.
-        - oss: Index of the offshore substation.
-        - onss: Index of the onshore substation.
-
-        Returns:
-        - The calculated distance multiplied by the binary decision variable indicating if the connection exists.
-        """
-        return haversine(model.oss_lon[oss], model.oss_lat[oss], model.onss_lon[onss], model.onss_lat[onss]) * model.select_ec_var[oss, onss]
-    
-    model.ec_dist_exp = Expression(model.viable_ec_ids, rule=ec_dist_rule)
+    print("Defining expressions...")
     
-    def iac_capacity_rule(model, wf, oss):
-        """
-        Calculate the capacity contribution of a wind farm (WF) to an offshore substation (OSS) through an inter-array cable (IAC).
-
-        Parameters:
-        - model: The Pyomo model object.
-        - wf: Index of the wind farm.
-        - oss: Index of the offshore substation.
-
-        Returns:
-        - The wind farm's capacity multiplied by the binary decision variable indicating if the connection exists.
-        """
-        return model.wf_cap[wf] * model.select_iac_var[wf, oss]
-    
-    model.iac_cap_exp = Expression(model.viable_iac_ids, rule=iac_capacity_rule)
-
     def oss_capacity_rule(model, oss):
         """
         Sum the capacities from all connected wind farms to an offshore substation (OSS).
@@ -858,7 +895,7 @@ def opt_model(workspace_folder):
         Returns:
         - The total capacity received by the OSS from connected wind farms.
         """
-        return sum(model.iac_cap_exp[wf, oss] * model.select_iac_var[wf, oss] for wf in model.wf_ids if (wf, oss) in model.viable_iac_ids)
+        return sum(wf_cap[wf] * model.select_iac_var[wf, oss] for wf in oss_to_wfs[oss])
     
     model.oss_cap_exp = Expression(model.oss_ids, rule=oss_capacity_rule)
 
@@ -889,41 +926,25 @@ def opt_model(workspace_folder):
         Returns:
         - The total capacity received by the ONSS from all connected OSS.
         """
-        return sum(model.ec_cap_exp[oss, onss] for oss in model.oss_ids if (oss, onss) in model.viable_ec_ids)
+        return sum(model.ec_cap_exp[oss, onss] for oss in onss_to_osss[onss])
 
     model.onss_cap_exp = Expression(model.onss_ids, rule=onss_capacity_rule)
 
-    def iac_cost_rule(model, wf, oss):
-        """
-        Calculate the cost of an inter-array cable (IAC) connection based on distance and capacity.
-
-        Parameters:
-        - model: The Pyomo model object.
-        - wf: Index of the wind farm.
-        - oss: Index of the offshore substation.
-
-        Returns:
-        - The calculated cost of the IAC.
-        """
-        return iac_cost_plh(model.iac_dist_exp[wf, oss], model.iac_cap_exp[wf, oss], polarity = "AC")
-        
-    model.iac_cost_exp = Expression(model.viable_iac_ids, rule=iac_cost_rule)
-
     def oss_cost_rule(model, oss):
         """
         Calculate the cost of maintaining an offshore substation (OSS) based on water depth, ice cover, and port distance,
-        adjusted by its capacity.
+        adjusted by its capacity. The fixed cost applies if the OSS is selected, the capacity cost to the connected capacity.
 
         Parameters:
         - model: The Pyomo model object.
         - oss: Index of the offshore substation.
 
         Returns:
-        - The calculated cost of the OSS.
+        - The calculated cost of the OSS, linear in the decision variables.
         """
-        return oss_cost_plh(model.oss_wdepth[oss], model.oss_icover[oss], model.oss_pdist[oss], model.oss_cap_exp[oss], polarity = "AC")
+        return oss_fixed_cost[oss] * model.select_oss_var[oss] + oss_capacity_cost[oss] * model.oss_cap_exp[oss]
 
-    model.oss_cost_exp = Expression(model.oss_ids, rule=oss_cost_rule)
+    model.oss_cost_exp = Expression(model.viable_oss_ids, rule=oss_cost_rule)
 
     def ec_cost_rule(model, oss, onss):
         """
@@ -937,7 +958,7 @@ def opt_model(workspace_folder):
         Returns:
         - The calculated cost of the EC.
         """
-        return ec_cost_plh(model.ec_dist_exp[oss, onss], model.ec_cap_exp[oss, onss], polarity = "AC")
+        return ec_cost_plh(ec_dist[oss, onss] * model.select_ec_var[oss, onss], model.ec_cap_exp[oss, onss], polarity = "AC")
     
     model.ec_cost_exp = Expression(model.viable_ec_ids, rule=ec_cost_rule)
 
@@ -953,7 +974,7 @@ def opt_model(workspace_folder):
         Returns:
         - The calculated operational cost of the ONSS if it exceeds its specific capacity threshold.
         """
-        return onss_cost_plh(model.onss_cap_exp[onss], model.onss_cthr[onss])
+        return onss_cost_plh(model.onss_cap_exp[onss], onss_cthr[onss])
 
     model.onss_cost_exp = Expression(model.onss_ids, rule=onss_cost_rule)
 
@@ -979,13 +1000,18 @@ def opt_model(workspace_folder):
         Returns:
         - The computed total cost of the network configuration, which the optimization process seeks to minimize.
         """
-        wf_total_cost = sum(model.wf_cost[wf] * model.select_wf_var[wf] for wf in model.viable_wf_ids)
-        oss_total_cost = sum(model.oss_cost_exp[oss] * model.select_oss_var[oss] for oss in model.viable_oss_ids)
+        # Wind farm and inter-array cable costs are fixed coefficients of their selection variables
+        linear_coefs = [wf_cost[wf] for wf in model.viable_wf_ids] + [iac_cost[wf, oss] for (wf, oss) in model.viable_iac_ids]
+        linear_vars = [model.select_wf_var[wf] for wf in model.viable_wf_ids] + [model.select_iac_var[wf, oss] for (wf, oss) in model.viable_iac_ids]
+        wf_iac_total_cost = LinearExpression(constant=0, linear_coefs=linear_coefs, linear_vars=linear_vars)
+
+        oss_total_cost = sum(model.oss_cost_exp[oss] for oss in model.viable_oss_ids)
         onss_total_costs = sum(model.onss_cost_exp[onss] * model.select_onss_var[onss] for onss in model.viable_onss_ids)
-        iac_total_cost = sum(model.iac_cost_exp[wf, oss] * model.select_iac_var[wf, oss] for (wf, oss) in model.viable_iac_ids)
-        ec_total_cost = sum(model.ec_cost_exp[oss, onss] * model.select_ec_var[oss, onss] for (oss, onss) in model.viable_ec_ids)
+
+        # The export cable cost expressions already include the selection variable
+        ec_total_cost = sum(model.ec_cost_exp[oss, onss] for (oss, onss) in model.viable_ec_ids)
         
-        return wf_total_cost + oss_total_cost + onss_total_costs + iac_total_cost + ec_total_cost
+        return wf_iac_total_cost + oss_total_cost + onss_total_costs + ec_total_cost
 
     # Set the objective in the model
     model.global_cost_obj = Objective(rule=global_cost_rule, sense=minimize)
@@ -1009,8 +1035,8 @@ def opt_model(workspace_folder):
         """
         global_cap_frac = 0.00001
         
-        min_required_capacity = global_cap_frac * sum(model.wf_cap[wf] for wf in model.viable_wf_ids)
-        return sum(model.wf_cap[wf] * model.select_wf_var[wf] for wf in model.viable_wf_ids) >= min_required_capacity
+        min_required_capacity = global_cap_frac * sum(wf_cap[wf] for wf in model.viable_wf_ids)
+        return sum(wf_cap[wf] * model.select_wf_var[wf] for wf in model.viable_wf_ids) >= min_required_capacity
     
     model.min_total_wf_capacity_con = Constraint(rule=min_total_wf_capacity_rule)
     
@@ -1026,10 +1052,27 @@ def opt_model(workspace_folder):
         Returns:
         - A constraint expression enforcing one-to-one connection between selected wind farms and offshore substations.
         """
-        return sum(model.select_iac_var[wf, oss] for oss in model.viable_oss_ids if (wf, oss) in model.viable_iac_ids) == model.select_wf_var[wf]
+        return sum(model.select_iac_var[wf, oss] for oss in wf_to_osss[wf]) == model.select_wf_var[wf]
 
     model.wind_farm_to_oss_con = Constraint(model.viable_wf_ids, rule=wind_farm_to_oss_rule)
 
+    def iac_to_oss_rule(model, wf, oss):
+        """
+        Ensure a wind farm can only be connected to an offshore substation that is selected.
+        This links the connected capacity to the fixed cost of the offshore substation.
+
+        Parameters:
+        - model: The Pyomo model object containing the decision variables and parameters.
+        - wf: The index of the wind farm.
+        - oss: The index of the offshore substation.
+
+        Returns:
+        - A constraint expression allowing the inter-array cable only if the offshore substation is selected.
+        """
+        return model.select_iac_var[wf, oss] <= model.select_oss_var[oss]
+
+    model.iac_to_oss_con = Constraint(model.viable_iac_ids, rule=iac_to_oss_rule)
+
     # def oss_to_onss_rule(model, oss):
     #     """
     #     Ensure each offshore substation that is connected to any wind farm transmits to exactly one onshore substation.
@@ -1072,7 +1115,7 @@ def opt_model(workspace_folder):
     if results.solver.status == SolverStatus.ok:
         if results.solver.termination_condition == TerminationCondition.optimal:
             print("Solver found an optimal solution.")
-            save_results(model, workspace_folder)
+            save_results(model, workspace_folder, data)
         elif results.solver.termination_condition == TerminationCondition.infeasible:
             print("Problem is infeasible. Check model constraints and data.")
         elif results.solver.termination_condition == TerminationCondition.unbounded:
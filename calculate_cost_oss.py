@@ -1,6 +1,20 @@
 import arcpy
 import numpy as np
 
+# Installation coefficients for different vehicles
+INST_COEFF = {
+    ('jacket', 'PSIV'): (1, 18.5, 24, 96, 200),
+    ('floating', 'HLCV'): (1, 22.5, 10, 0, 40),
+    ('floating', 'AHV'): (3, 18.5, 30, 90, 40)
+}
+
+# Decommissioning coefficients for different vehicles
+DECO_COEFF = {
+    ('jacket', 'PSIV'): (1, 18.5, 24, 96, 200),
+    ('floating', 'HLCV'): (1, 22.5, 10, 0, 40),
+    ('floating', 'AHV'): (3, 18.5, 30, 30, 40)
+}
+
 def present_value(equip_cost, inst_cost, ope_cost_yearly, deco_cost):
     """
     Calculate the total present value of cable cost.
@@ -114,37 +128,24 @@ def oss_cost_lin(water_depth, ice_cover, port_distance, oss_capacity):
         Returns:
         - float: Calculated installation or decommissioning cost.
         """
-        # Installation coefficients for different vehicles
-        inst_coeff = {
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-            ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-            ('floating','AHV'): (3, 18.5, 30, 90, 40)
-        }
-
-        # Decommissioning coefficients for different vehicles
-        deco_coeff = {
-            ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-            ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-            ('floating','AHV'): (3, 18.5, 30, 30, 40)
-        }
-
         # Choose the appropriate coefficients based on the operation type
-        coeff = inst_coeff if operation == 'inst' else deco_coeff
+        coeff = INST_COEFF if operation == 'inst' else DECO_COEFF
             
         if support_structure == 'jacket':
-            c1, c2, c3, c4, c5 = coeff[('jacket' 'PSIV')]
+            c1, c2, c3, c4, c5 = coeff[('jacket', 'PSIV')]
             # Calculate installation cost for jacket
             total_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
         elif support_structure == 'floating':
-            total_cost = 0
-            
-            # Iterate over the coefficients for floating (HLCV and AHV)
-            for vessel_type in [('floating', 'HLCV'), ('floating', 'AHV')]:
-                c1, c2, c3, c4, c5 = coeff[vessel_type]
-                # Calculate installation cost for the current vessel type
-                vessel_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
-                # Add the cost for the current vessel type to the total cost
-                total_cost += vessel_cost
+            # Calculate installation cost for the heavy lift cargo vessel
+            c1, c2, c3, c4, c5 = coeff[('floating', 'HLCV')]
+            hlcv_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
+
+            # Calculate installation cost for the anchor handling vessel
+            c1, c2, c3, c4, c5 = coeff[('floating', 'AHV')]
+            ahv_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1000) / 24
+
+            # Total cost for floating is the sum of both vessels
+            total_cost = hlcv_cost + ahv_cost
         
         return total_cost
 
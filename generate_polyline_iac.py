@@ -1,24 +1,99 @@
 import arcpy
-import networkx as nx
+import numpy as np
 import os
-from math import radians, sin, cos, sqrt, atan2
+import struct
+from collections import defaultdict
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
 
-def haversine(lat1, lon1, lat2, lon2):
+def haversine_array(lat1, lon1, lat2, lon2):
     """
-    Calculate the great-circle distance between two points on the Earth surface.
+    Calculate the great-circle distances between arrays of points on the Earth surface, broadcast against each other.
     """
     # Convert latitude and longitude from degrees to radians
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    lat1, lon1, lat2, lon2 = np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)
 
     # Haversine formula
     dlat = lat2 - lat1
     dlon = lon2 - lon1
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
     r = 6371 * 1e3 # Radius of Earth in meters
-    distance = r * c  
+    distance = r * c
 
-    return round(distance)
+    return distance
+
+def haversine_matrix(lats, lons):
+    """
+    Calculate the great-circle distances between all pairs of points on the Earth surface at once.
+    """
+    return haversine_array(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+def line_wkb(start, end):
+    """
+    Encodes a straight line between two points as OGC well-known binary (WKB), so it can be inserted without building arcpy geometries.
+    """
+    # Little-endian byte order (1), LineString geometry type (2), number of points (2), followed by the x and y of each point
+    return struct.pack('<BIIdddd', 1, 2, 2, start[0], start[1], end[0], end[1])
+
+def inter_array_cables(turbine_points, substation_point, turbine_capacity):
+    """
+    Computes the inter-array cable sections of a single wind farm, along the Minimum Spanning Tree of its turbines
+    connected to the substation at the closest turbine. Only plain coordinates and numbers are returned, so the
+    layout of a wind farm can be computed independently of arcpy.
+
+    Returns:
+    - list: Cable sections as (start point, end point, distance, capacity) tuples, starting with the substation connection.
+    """
+    # Calculate the Haversine distances between all turbines at once
+    turbine_xy = np.array(turbine_points, dtype=np.float64)
+    distances = haversine_matrix(turbine_xy[:, 1], turbine_xy[:, 0])
+
+    # Compute the Minimum Spanning Tree over the upper triangle of the distance matrix,
+    # zero distances are raised to the smallest float as zero entries are no edges in a sparse graph
+    weights = np.triu(np.where(distances > 0, distances, np.finfo(np.float64).tiny), 1)
+    mst = minimum_spanning_tree(csr_matrix(weights))
+
+    # Neighbouring turbines of each turbine in the Minimum Spanning Tree
+    neighbors = defaultdict(list)
+    for i, j in zip(*mst.nonzero()):
+        neighbors[i].append(j)
+        neighbors[j].append(i)
+
+    # Find the closest turbine to the substation and add the connection with the total wind farm capacity
+    substation_dist = haversine_array(substation_point[1], substation_point[0], turbine_xy[:, 1], turbine_xy[:, 0])
+    closest_turbine = int(np.argmin(substation_dist))
+    min_dist = float(substation_dist[closest_turbine])
+
+    cables = [(tuple(substation_point), tuple(turbine_points[closest_turbine]), min_dist, turbine_capacity * len(turbine_points))]
+
+    # Traverse the MST from the closest turbine in post-order to add cable sections and sum capacities correctly,
+    # the capacity of a turbine is complete once all turbines behind it have been visited
+    capacities = [turbine_capacity] * len(turbine_points)
+    edges, edge_capacities = [], []
+    stack = [(closest_turbine, None, False)]
+    while stack:
+        node, parent, visited = stack.pop()
+        if visited:
+            if parent is not None:
+                capacities[parent] += capacities[node]
+                edges.append((parent, node))
+                edge_capacities.append(capacities[node])
+            continue
+        
+        stack.append((node, parent, True))
+        for neighbor in reversed(neighbors[node]):
+            if neighbor != parent:
+                stack.append((neighbor, node, False))
+
+    # Endpoint coordinates of shape (E, 2, 2) and distances of shape (E,) of all cable sections
+    edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+    edge_xy = turbine_xy[edges]
+    edge_dist = distances[edges[:, 0], edges[:, 1]]
+
+    cables.extend((tuple(start), tuple(end), dist, capacity) for (start, end), dist, capacity in zip(edge_xy.tolist(), edge_dist.tolist(), edge_capacities))
+
+    return cables
 
 def create_and_add_inter_array_cables():
     """
@@ -68,19 +143,22 @@ def create_and_add_inter_array_cables():
         ["Capacity", "DOUBLE"]
     ])
 
-    # Insert cursor for the new feature class
-    cursor = arcpy.da.InsertCursor(output_fc, ["SHAPE@", "WF_ID", "Distance", "Capacity"])
+    # Rows of the cable sections, inserted into the new feature class at once
+    cable_rows = []
 
     # Create a dictionary to store total capacities for each substation
     substation_capacities = {}
 
-    # Get unique WF_IDs from the turbine layer
-    wf_ids = set(row[0] for row in arcpy.da.SearchCursor(turbine_layer, ["WF_ID"]))
+    # Get turbine and substation coordinates grouped by WF_ID, reading each layer once
+    turbines_by_wf, substations_by_wf = defaultdict(list), defaultdict(list)
+    for point, wf_id in arcpy.da.SearchCursor(turbine_layer, ["SHAPE@XY", "WF_ID"]):
+        turbines_by_wf[wf_id].append(point)
+    for point, wf_id in arcpy.da.SearchCursor(substation_layer, ["SHAPE@XY", "WF_ID"]):
+        substations_by_wf[wf_id].append(point)
 
-    for wf_id in wf_ids:
-        # Get turbine and substation coordinates for the current WF_ID
-        turbine_points = [row[0] for row in arcpy.da.SearchCursor(turbine_layer, ["SHAPE@XY"], f"WF_ID = {wf_id}")]
-        substation_points = [row[0] for row in arcpy.da.SearchCursor(substation_layer, ["SHAPE@XY"], f"WF_ID = {wf_id}")]
+    for wf_id, turbine_points in turbines_by_wf.items():
+        # Get substation coordinates for the current WF_ID
+        substation_points = substations_by_wf.get(wf_id, [])
 
         if not turbine_points:
             arcpy.AddWarning(f"No turbines found for WF_ID '{wf_id}'. Skipping...")
@@ -92,59 +170,20 @@ def create_and_add_inter_array_cables():
 
         substation_point = substation_points[0]
 
-        # Create a graph and add nodes for each turbine
-        G = nx.Graph()
-        for i, point in enumerate(turbine_points):
-            G.add_node(i, pos=point)
-
-        # Add edges with weights (Haversine distances) between all turbines
-        for i in range(len(turbine_points)):
-            for j in range(i + 1, len(turbine_points)):
-                dist = haversine(turbine_points[i][1], turbine_points[i][0], turbine_points[j][1], turbine_points[j][0])
-                G.add_edge(i, j, weight=dist)
-
-        # Compute the Minimum Spanning Tree
-        mst = nx.minimum_spanning_tree(G)
-
         # Calculate total wind farm capacity
         total_wind_farm_capacity = turbine_capacity * len(turbine_points)
         
         # Store the total capacity for the substation
         substation_capacities[wf_id] = total_wind_farm_capacity
 
-        # Traverse the MST to add cable sections and sum capacities correctly
-        def accumulate_capacity(G, node, parent=None):
-            total_capacity = turbine_capacity
-            for neighbor in G.neighbors(node):
-                if neighbor == parent:
-                    continue
-                edge_data = G.get_edge_data(node, neighbor)
-                dist = edge_data['weight']
-                array = arcpy.Array([arcpy.Point(*G.nodes[node]['pos']), arcpy.Point(*G.nodes[neighbor]['pos'])])
-                polyline = arcpy.Polyline(array, spatial_ref)
-                child_capacity = accumulate_capacity(G, neighbor, node)
-                cursor.insertRow([polyline, wf_id, dist, child_capacity])
-                total_capacity += child_capacity
-            return total_capacity
-
-        # Find the closest turbine to the substation and add the connection
-        min_dist = float('inf')
-        closest_turbine = None
-        for i, point in enumerate(turbine_points):
-            dist = haversine(substation_point[1], substation_point[0], point[1], point[0])
-            if dist < min_dist:
-                min_dist = dist
-                closest_turbine = i
-
-        array = arcpy.Array([arcpy.Point(*substation_point), arcpy.Point(*turbine_points[closest_turbine])])
-        polyline = arcpy.Polyline(array, spatial_ref)
-        cursor.insertRow([polyline, wf_id, min_dist, total_wind_farm_capacity])
-
-        # Accumulate capacity for the rest of the MST
-        accumulate_capacity(mst, closest_turbine)
-
-    # Cleanup
-    del cursor
+        # Compute the cable sections of the wind farm and add them as WKB line strings
+        for start, end, dist, capacity in inter_array_cables(turbine_points, substation_point, turbine_capacity):
+            cable_rows.append([line_wkb(start, end), wf_id, dist, capacity])
+
+    # Insert cursor for the new feature class
+    with arcpy.da.InsertCursor(output_fc, ["SHAPE@WKB", "WF_ID", "Distance", "Capacity"]) as cursor:
+        for row in cable_rows:
+            cursor.insertRow(row)
 
     print("Inter-array cable layout created.")
 
@@ -1,8 +1,13 @@
 from pyomo.environ import *
+from pyomo.core.expr.numeric_expr import LinearExpression
 import numpy as np
 import os
-from itertools import product
-from scripts.present_value import present_value
+from collections import defaultdict
+from itertools import islice
+from scripts.present_value import present_value_single
+
+# Installation year of the export cables, the first year of the present value calculation
+FIRST_YEAR = 2024
 
 def onss_cost_lin(capacity, threshold):
     """
@@ -54,7 +59,7 @@ def ec_cost_lin(distance, capacity, polarity="AC"):
     deco_cost = 0.5 * inst_cost
 
     # Calculate present value
-    total_cost = present_value(equip_cost, inst_cost, ope_cost_yearly, deco_cost)
+    total_cost = present_value_single(FIRST_YEAR, equip_cost, inst_cost, ope_cost_yearly, deco_cost)
 
     return total_cost
 
@@ -80,15 +85,31 @@ def find_viable_ec(wf_lon, wf_lat, onss_lon, onss_lat, wf_iso, onss_iso):
     ensuring that they belong to the same country based on their ISO codes.
     
     Parameters are dictionaries indexed by substation IDs with longitude, latitude, and ISO codes.
+
+    Returns:
+    - dict: Distance in km of each viable connection, keyed by (wf_id, onss_id).
     """
-    connections = []
-    for wf_id, onss_id in product(wf_lon.keys(), onss_lon.keys()):
-        # Calculate the distance first to see if they are within the viable range
-        distance = haversine(wf_lon[wf_id], wf_lat[wf_id], onss_lon[onss_id], onss_lat[onss_id])
-        if distance <= 300:  # Check if the distance is within 300 km
-            # Then check if the ISO codes match for the current offshore and onshore substation pair
-            if wf_iso[wf_id] == onss_iso[onss_id]:
-                connections.append((int(wf_id), int(onss_id)))
+    wf_ids = np.array(list(wf_lon.keys()), dtype=int)
+    onss_ids = np.array(list(onss_lon.keys()), dtype=int)
+
+    wf_coords = np.array([(wf_lon[wf_id], wf_lat[wf_id]) for wf_id in wf_ids], dtype=float).reshape(-1, 2)
+    onss_coords = np.array([(onss_lon[onss_id], onss_lat[onss_id]) for onss_id in onss_ids], dtype=float).reshape(-1, 2)
+    wf_iso_arr = np.array([wf_iso[wf_id] for wf_id in wf_ids], dtype=int)
+    onss_iso_arr = np.array([onss_iso[onss_id] for onss_id in onss_ids], dtype=int)
+
+    connections = {}
+    for iso in np.intersect1d(wf_iso_arr, onss_iso_arr):
+        # Only pairs within the same country are considered, so the distances are calculated per country
+        wf_rows = np.flatnonzero(wf_iso_arr == iso)
+        onss_rows = np.flatnonzero(onss_iso_arr == iso)
+
+        # Calculate the distances of all pairs in the country at once by broadcasting the coordinates
+        distances = haversine(wf_coords[wf_rows, 0, None], wf_coords[wf_rows, 1, None], onss_coords[None, onss_rows, 0], onss_coords[None, onss_rows, 1])
+
+        # Keep the pairs within 300 km
+        rows, cols = np.nonzero(distances <= 300)
+        connections.update({(int(wf_ids[wf_rows[r]]), int(onss_ids[onss_rows[c]])): float(distances[r, c]) for r, c in zip(rows, cols)})
+
     return connections
 
 def get_viable_entities(viable_ec):
@@ -116,15 +137,16 @@ def get_viable_entities(viable_ec):
 
     return viable_wf, viable_onss
 
-def opt_model(workspace_folder):
+def opt_model(workspace_folder, verbose=False):
     """
     Create an optimization model for offshore wind farm layout optimization.
 
     Parameters:
     - workspace_folder (str): The path to the workspace folder containing datasets.
+    - verbose (bool): Print the variable ids and stream the solver output to the console. Defaults to False.
 
     Returns:
-    - model: Pyomo ConcreteModel object representing the optimization model.
+    - None: The selected components are saved to the results folder, so the model is not kept after solving.
     """
     
     """
@@ -211,8 +233,15 @@ def opt_model(workspace_folder):
     """
     print("Defining decision parameters...")
     
-    # Calculate viable connections
-    viable_ec = find_viable_ec(wf_lon, wf_lat, onss_lon, onss_lat, wf_iso, onss_iso)
+    # Calculate viable connections and their distances
+    ec_dist = find_viable_ec(wf_lon, wf_lat, onss_lon, onss_lat, wf_iso, onss_iso)
+    viable_ec = list(ec_dist)
+
+    # Onshore substations connectable to each wind farm and vice versa
+    onss_of_wf, wf_of_onss = defaultdict(list), defaultdict(list)
+    for wf, onss in viable_ec:
+        onss_of_wf[wf].append(onss)
+        wf_of_onss[onss].append(wf)
 
     model.viable_ec_ids = Set(initialize= viable_ec, dimen=2)
     
@@ -236,7 +265,8 @@ def opt_model(workspace_folder):
 
     # Iterate over the dictionary and print variable ids and their lengths
     for name, var in print_variables.items():
-        print(f"{name} ids:", list(var)[:20])  # Print variable ids
+        if verbose:
+            print(f"{name} ids:", list(islice(var, 20)))  # Print the first variable ids
         print(f"Number of {name} indices:", len(var))  # Print number of indices
 
     """
@@ -244,18 +274,20 @@ def opt_model(workspace_folder):
     """
     print("Defining expressions...")
 
+    # The rules below read the fixed data from the plain dictionaries, the Params are kept for saving the results
+
     """
     Define expressions for wind farms (WF)
     """
     def wf_cost_rule(model, wf):
-        return model.wf_cost[wf] * model.wf_bool_var[wf]
+        return wf_cost[wf] * model.wf_bool_var[wf]
     model.wf_cost_exp = Expression(model.viable_wf_ids, rule=wf_cost_rule)
 
     """
     Define distance and capacity expressions for Export Cables (EC)
     """
     def ec_distance_rule(model, wf, onss):
-        return haversine(model.wf_lon[wf], model.wf_lat[wf], model.onss_lon[onss], model.onss_lat[onss])
+        return ec_dist[wf, onss]
     model.ec_dist_exp = Expression(model.viable_ec_ids, rule=ec_distance_rule)
 
     def ec_cost_rule(model, wf, onss):
@@ -267,7 +299,7 @@ def opt_model(workspace_folder):
     """
 
     def onss_cost_rule(model, onss):
-        return onss_cost_lin(model.onss_cap_var[onss], model.onss_thold[onss])
+        return onss_cost_lin(model.onss_cap_var[onss], onss_thold[onss])
     model.onss_cost_exp = Expression(model.viable_onss_ids, rule=onss_cost_rule)
 
     """
@@ -311,8 +343,10 @@ def opt_model(workspace_folder):
         Ensure the selected wind farms collectively meet a minimum required capacity.
         This capacity is specified as a fraction of the total potential capacity of all considered wind farms.
         """
-        min_req_cap = 1 * sum(model.wf_cap[wf] for wf in model.viable_wf_ids)
-        return sum(model.wf_bool_var[wf] * model.wf_cap[wf] for wf in model.viable_wf_ids) >= min_req_cap
+        min_req_cap = 1 * sum(wf_cap[wf] for wf in model.viable_wf_ids)
+        linear_coefs = [wf_cap[wf] for wf in model.viable_wf_ids]
+        linear_vars = [model.wf_bool_var[wf] for wf in model.viable_wf_ids]
+        return LinearExpression(constant=0, linear_coefs=linear_coefs, linear_vars=linear_vars) >= min_req_cap
     model.tot_wf_cap_con = Constraint(rule=tot_wf_cap_rule)
     
     print("Defining capacity constraints...")
@@ -322,8 +356,10 @@ def opt_model(workspace_folder):
         Ensure each selected wind farm is connected to exactly one energy hub.
         The connection capacity must match the selected wind farm's capacity.
         """
-        connect_to_onss = sum(model.ec_cap_var[wf, onss] for onss in model.viable_onss_ids if (wf, onss) in model.viable_ec_ids)
-        return connect_to_onss >= model.wf_bool_var[wf] * model.wf_cap[wf]
+        # Connected capacity minus the capacity of the selected wind farm, built directly from its coefficients
+        linear_coefs = [1] * len(onss_of_wf[wf]) + [-wf_cap[wf]]
+        linear_vars = [model.ec_cap_var[wf, onss] for onss in onss_of_wf[wf]] + [model.wf_bool_var[wf]]
+        return LinearExpression(constant=0, linear_coefs=linear_coefs, linear_vars=linear_vars) >= 0
     model.ec_cap_connect_con = Constraint(model.viable_wf_ids, rule=ec_cap_connect_rule)
 
     def onss_cap_connect_rule(model, onss):
@@ -331,8 +367,10 @@ def opt_model(workspace_folder):
         Ensure the capacity of each energy hub matches or exceeds the total capacity of the connected wind farms.
         This ensures that the substation can handle all incoming power from the connected farms.
         """
-        connect_from_wf = sum(model.ec_cap_var[wf, onss] for wf in model.viable_wf_ids if (wf, onss) in model.viable_ec_ids)
-        return model.onss_cap_var[onss] >= connect_from_wf
+        # Substation capacity minus the connected capacity, built directly from its coefficients
+        linear_coefs = [1] + [-1] * len(wf_of_onss[onss])
+        linear_vars = [model.onss_cap_var[onss]] + [model.ec_cap_var[wf, onss] for wf in wf_of_onss[onss]]
+        return LinearExpression(constant=0, linear_coefs=linear_coefs, linear_vars=linear_vars) >= 0
     model.onss_cap_connect_con = Constraint(model.viable_onss_ids, rule=onss_cap_connect_rule)
     
     print("Defining the cost variables...")
@@ -343,7 +381,26 @@ def opt_model(workspace_folder):
         """
         return model.onss_cost_var[onss] >= model.onss_cost_exp[onss]
     model.onss_cost_con = Constraint(model.viable_onss_ids, rule=onss_cost_rule)
-    
+
+    print("Setting the starting solution...")
+
+    # Connect every wind farm to its nearest viable onshore substation, which satisfies all constraints,
+    # and pass it to the solver as the initial values of the variables
+    for wf, onss in model.viable_ec_ids:
+        model.ec_cap_var[wf, onss].value = 0
+
+    for onss in model.viable_onss_ids:
+        model.onss_cap_var[onss].value = 0
+
+    for wf in model.viable_wf_ids:
+        nearest_onss = min(onss_of_wf[wf], key=lambda onss: ec_dist[wf, onss])
+        model.wf_bool_var[wf].value = 1
+        model.ec_cap_var[wf, nearest_onss].value = wf_cap[wf]
+        model.onss_cap_var[nearest_onss].value += wf_cap[wf]
+
+    for onss in model.viable_onss_ids:
+        model.onss_cost_var[onss].value = max(0, onss_cost_lin(model.onss_cap_var[onss].value, onss_thold[onss]))
+
     """
     Solve the model
     """
@@ -355,8 +412,9 @@ def opt_model(workspace_folder):
         'tolerances/optimality': 1e-5,   # Tolerance for optimality conditions
         'tolerances/integrality': 1e-5,  # Tolerance for integer variable constraints
         'presolving/maxrounds': -1,      # Max presolve iterations to simplify the model
+        'constraints/components/maxprerounds': 0,  # Skip the components presolver, the wind farms are coupled by the total capacity constraint
         'propagating/maxrounds': -1,     # Max constraint propagation rounds
-        'parallel/threads': -1,          # Use all CPU cores for parallel processing
+        'parallel/maxnthreads': os.cpu_count(),  # Use all CPU cores when SCIP runs its concurrent solvers
         'nodeselection': 'hybrid',       # Hybrid node selection in branch and bound
         'branching/varsel': 'pscost',    # Pseudocost variable selection in branching
         'separating/aggressive': 1,   # Enable aggressive separation
@@ -369,6 +427,9 @@ def opt_model(workspace_folder):
         'emphasis/optimality': 1,   # Emphasize optimality
         'emphasis/memory': 1,           # Emphasize memory
         'separating/maxrounds': 10,  # Limit cut rounds at non-root nodes
+        'separating/maxroundsroot': 5,   # Limit cut rounds at the root node
+        'separating/maxcutsroot': 200,   # Limit cuts added per round at the root node
+        'separating/cutagelimit': 20,    # Remove cuts that stay inactive for this many separation rounds
         'heuristics/feaspump/freq': 10,  # Frequency of feasibility pump heuristic
         'tol': 0.01,  # Set the relative optimality gap tolerance to 1%
         'display/verblevel': 4  # Set verbosity level to display information about the solution
@@ -501,7 +562,7 @@ def opt_model(workspace_folder):
     solver_log_path = os.path.join(workspace_folder, "results", "radial", "solverlog_r.txt")
 
     # Solve the optimisation model
-    results = solver.solve(model, tee=True, logfile=solver_log_path, options=solver_options)
+    results = solver.solve(model, tee=verbose, logfile=solver_log_path, options=solver_options)
 
     # Detailed checking of solver results
     if results.solver.status == SolverStatus.ok:
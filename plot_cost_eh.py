@@ -12,26 +12,61 @@ font = {'family': 'serif',
 # Set font
 plt.rc('font', **font)
 
+# First year of the energy hubs, the installation year of the present value calculation
+FIRST_YEAR = 2024
+
+
+def set_ticks_and_grid(ax, x_major, x_minor, y_major, y_minor):
+    """
+    Set the major and minor tick spacing of both axes and draw the major and minor grid lines.
+    """
+    ax.xaxis.set_major_locator(MultipleLocator(x_major))
+    ax.xaxis.set_minor_locator(MultipleLocator(x_minor))
+    ax.yaxis.set_major_locator(MultipleLocator(y_major))
+    ax.yaxis.set_minor_locator(MultipleLocator(y_minor))
+    ax.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
+    ax.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
+    ax.minorticks_on()
+
+def eh_equip_cost_lin(water_depth, ice_cover, eh_capacity):
+    """
+    Calculate the energy hub equipment cost. The water depth and capacity can be given as arrays,
+    in which case the cost of all elements is calculated at once.
+    """
+    # Calculate equipment cost for both support structures and select by water depth
+    supp_cost_jacket, conv_cost = equip_cost_lin(water_depth, "jacket", ice_cover, eh_capacity)
+    supp_cost_floating, _ = equip_cost_lin(water_depth, "floating", ice_cover, eh_capacity)
+    supp_cost = np.where(np.asarray(water_depth) < 120, supp_cost_jacket, supp_cost_floating)
+
+    equip_cost = supp_cost + conv_cost
+
+    # Broadcast the costs that do not depend on all inputs to the same shape
+    supp_cost, conv_cost, equip_cost = np.broadcast_arrays(supp_cost, conv_cost, equip_cost)
+
+    return supp_cost, conv_cost, equip_cost
 
 def eh_cost_lin(water_depth, ice_cover, port_distance, eh_capacity):
     """
+    Calculate the present value of the energy hub cost. The water depth, port distance and capacity
+    can be given as arrays, in which case the cost of all elements is calculated at once.
     """
-    # Determine support structure
-    supp_structure = check_supp(water_depth)
+    # Determine support structure of each water depth
+    is_jacket = np.asarray(water_depth) < 120
     
     # Calculate equipment cost
-    supp_cost, conv_cost = equip_cost_lin(water_depth, supp_structure, ice_cover, eh_capacity)
-
-    equip_cost = supp_cost + conv_cost
+    supp_cost, conv_cost, equip_cost = eh_equip_cost_lin(water_depth, ice_cover, eh_capacity)
     
     # Calculate installation and decommissioning cost
-    inst_cost = inst_deco_cost_lin(supp_structure, port_distance, "inst")
-    deco_cost = inst_deco_cost_lin(supp_structure, port_distance, "deco")
+    inst_cost = np.where(is_jacket, inst_deco_cost_lin("jacket", port_distance, "inst"), inst_deco_cost_lin("floating", port_distance, "inst"))
+    deco_cost = np.where(is_jacket, inst_deco_cost_lin("jacket", port_distance, "deco"), inst_deco_cost_lin("floating", port_distance, "deco"))
 
     # Calculate yearly operational cost
     ope_cost_yearly = 0.03 * conv_cost
     
-    total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = present_value(equip_cost, inst_cost, ope_cost_yearly, deco_cost)  # Calculate present value of cost
+    total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = present_value(FIRST_YEAR, equip_cost, inst_cost, ope_cost_yearly, deco_cost)  # Calculate present value of cost
+
+    # Broadcast the costs that do not depend on all inputs to the same shape
+    total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = np.broadcast_arrays(total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost)
 
     return total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost
 
@@ -41,15 +76,7 @@ def plot_total_cost_vs_water_depth():
     port_distance = 50  # Assuming a constant port distance
     eh_capacity = 1000  # Assuming a constant energy hub capacity of 1GW
 
-    total_costs, equip_costs, inst_costs, total_ope_costs, deco_costs = [], [], [], [], []
-
-    for wd in water_depths:
-        total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = eh_cost_lin(wd, ice_cover, port_distance, eh_capacity)
-        total_costs.append(total_cost)
-        equip_costs.append(equip_cost)
-        inst_costs.append(inst_cost)
-        total_ope_costs.append(total_ope_cost)
-        deco_costs.append(deco_cost)
+    total_costs, equip_costs, inst_costs, total_ope_costs, deco_costs = eh_cost_lin(water_depths, ice_cover, port_distance, eh_capacity)
 
     fig, axs = plt.subplots(2, 1, figsize=(6, 6), gridspec_kw={'height_ratios': [4, 1]}, sharex=True)
     
@@ -62,8 +89,7 @@ def plot_total_cost_vs_water_depth():
 
     axs[0].set_xlim(0, 300)
     axs[0].set_ylim(0, 100)
-    axs[0].yaxis.set_major_locator(MultipleLocator(25))
-    axs[0].yaxis.set_minor_locator(MultipleLocator(5))
+    set_ticks_and_grid(axs[0], 50, 5, 25, 5)
 
     # Plotting the smaller range
     axs[1].plot(water_depths, total_costs, label='Total PV')
@@ -73,16 +99,9 @@ def plot_total_cost_vs_water_depth():
     axs[1].plot(water_depths, deco_costs, label='Decommissioning PV')
 
     axs[1].set_ylim(0, 2)
-    axs[1].yaxis.set_major_locator(MultipleLocator(1))
-    axs[1].yaxis.set_minor_locator(MultipleLocator(0.25))
+    set_ticks_and_grid(axs[1], 50, 5, 1, 0.25)
 
     for ax in axs:
-        ax.xaxis.set_major_locator(MultipleLocator(50))
-        ax.xaxis.set_minor_locator(MultipleLocator(5))
-        ax.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-        ax.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-        ax.minorticks_on()
-        
         ax.axvline(x=120, color='grey', linewidth='1.5', linestyle='--')
         
     axs[0].text(4, 5, 'Jacket', rotation=90, verticalalignment='bottom')
@@ -104,15 +123,7 @@ def plot_total_cost_vs_capacity(water_depth):
     ice_cover = 0  # Assuming no ice cover for simplicity
     port_distance = 50  # Assuming a constant port distance
 
-    total_costs, equip_costs, inst_costs, total_ope_costs, deco_costs = [], [], [], [], []
-
-    for eh_capacity in eh_capacities:
-        total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = eh_cost_lin(water_depth, ice_cover, port_distance, eh_capacity)
-        total_costs.append(total_cost)
-        equip_costs.append(equip_cost)
-        inst_costs.append(inst_cost)
-        total_ope_costs.append(total_ope_cost)
-        deco_costs.append(deco_cost)
+    total_costs, equip_costs, inst_costs, total_ope_costs, deco_costs = eh_cost_lin(water_depth, ice_cover, port_distance, eh_capacities)
 
     fig, axs = plt.subplots(2, 1, figsize=(6, 6), gridspec_kw={'height_ratios': [4, 1]}, sharex=True)
 
@@ -125,8 +136,7 @@ def plot_total_cost_vs_capacity(water_depth):
 
     axs[0].set_xlim(250, 2000)
     axs[0].set_ylim(0, 175)
-    axs[0].yaxis.set_major_locator(MultipleLocator(25))
-    axs[0].yaxis.set_minor_locator(MultipleLocator(5))
+    set_ticks_and_grid(axs[0], 250, 25, 25, 5)
 
     # Plotting the smaller range
     axs[1].plot(eh_capacities, total_costs, label='Total PV')
@@ -136,16 +146,8 @@ def plot_total_cost_vs_capacity(water_depth):
     axs[1].plot(eh_capacities, deco_costs, label='Decommissioning PV')
 
     axs[1].set_ylim(0, 2)
-    axs[1].yaxis.set_major_locator(MultipleLocator(2))
-    axs[1].yaxis.set_minor_locator(MultipleLocator(0.5))
+    set_ticks_and_grid(axs[1], 250, 25, 2, 0.5)
 
-    for ax in axs:
-        ax.xaxis.set_major_locator(MultipleLocator(250))
-        ax.xaxis.set_minor_locator(MultipleLocator(25))
-        ax.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-        ax.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-        ax.minorticks_on()
-        
     supp_struct_str = 'Jacket' if water_depth < 120 else 'Floating'
     axs[0].text(275, axs[0].get_ylim()[1] * 0.05, supp_struct_str, rotation=90, verticalalignment='bottom')
 
@@ -165,15 +167,7 @@ def plot_equip_cost_vs_water_depth():
     ice_cover = 0  # Assuming no ice cover for simplicity
     eh_capacity = 1000  # Assuming a constant energy hub capacity of 1GW
 
-    supp_costs, conv_costs, equip_costs = [], [], []
-
-    for wd in water_depths:
-        support_structure = check_supp(wd)
-        supp_cost, conv_cost = equip_cost_lin(wd, support_structure, ice_cover, eh_capacity)
-        equip_cost = supp_cost + conv_cost
-        supp_costs.append(supp_cost)
-        conv_costs.append(conv_cost)
-        equip_costs.append(equip_cost)
+    supp_costs, conv_costs, equip_costs = eh_equip_cost_lin(water_depths, ice_cover, eh_capacity)
 
     plt.figure(figsize=(6, 5))
     plt.plot(water_depths, supp_costs, label='Support Structure Cost')
@@ -184,17 +178,8 @@ def plot_equip_cost_vs_water_depth():
     plt.xlim(0, 300)
     plt.ylim(0, 100)
 
-    # Set the number of major ticks and minor ticks
-    x_major_locator = MultipleLocator(50)
-    x_minor_locator = MultipleLocator(5)
-    y_major_locator = MultipleLocator(25)
-    y_minor_locator = MultipleLocator(5)
-
-    # Apply the major and minor tick locators
-    plt.gca().xaxis.set_major_locator(x_major_locator)
-    plt.gca().xaxis.set_minor_locator(x_minor_locator)
-    plt.gca().yaxis.set_major_locator(y_major_locator)
-    plt.gca().yaxis.set_minor_locator(y_minor_locator)
+    # Set the major and minor ticks and grid lines
+    set_ticks_and_grid(plt.gca(), 50, 5, 25, 5)
 
     # Add vertical lines for support structure domains
     plt.axvline(x=120, color='grey', linewidth=1.5, linestyle='--')
@@ -203,10 +188,6 @@ def plot_equip_cost_vs_water_depth():
     plt.text(4, plt.ylim()[1] * 0.05, 'Jacket', rotation=90, verticalalignment='bottom')
     plt.text(124, plt.ylim()[1] * 0.05, 'Floating', rotation=90, verticalalignment='bottom')
     
-    plt.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-    plt.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-    plt.minorticks_on()
-    
     plt.xlabel('Water Depth (m)')
     plt.ylabel('Cost (M\u20AC)')
     
@@ -223,14 +204,9 @@ def plot_inst_deco_cost_vs_port_distance(water_depths):
     fig, axs = plt.subplots(2, 1, figsize=(6, 6), gridspec_kw={'height_ratios': [1, 1]}, sharex=True)
     
     for i, water_depth in enumerate(water_depths):
-        inst_costs, deco_costs = [], []
-
-        for pd in port_distances:
-            support_structure = check_supp(water_depth)
-            inst_cost = inst_deco_cost_lin(support_structure, pd, "inst")
-            deco_cost = inst_deco_cost_lin(support_structure, pd, "deco")
-            inst_costs.append(inst_cost)
-            deco_costs.append(deco_cost)
+        support_structure = check_supp(water_depth)
+        inst_costs = inst_deco_cost_lin(support_structure, port_distances, "inst")
+        deco_costs = inst_deco_cost_lin(support_structure, port_distances, "deco")
 
         axs[i].plot(port_distances, inst_costs, label='Installation Cost')
         axs[i].plot(port_distances, deco_costs, label='Decommissioning Cost')
@@ -239,19 +215,7 @@ def plot_inst_deco_cost_vs_port_distance(water_depths):
         axs[i].set_xlim(0, 300)
         axs[i].set_ylim(0, 1.5)
 
-        x_major_locator = MultipleLocator(50)
-        x_minor_locator = MultipleLocator(10)
-        y_major_locator = MultipleLocator(0.25)
-        y_minor_locator = MultipleLocator(0.05)
-
-        axs[i].xaxis.set_major_locator(x_major_locator)
-        axs[i].xaxis.set_minor_locator(x_minor_locator)
-        axs[i].yaxis.set_major_locator(y_major_locator)
-        axs[i].yaxis.set_minor_locator(y_minor_locator)
-
-        axs[i].grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-        axs[i].grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-        axs[i].minorticks_on()
+        set_ticks_and_grid(axs[i], 50, 10, 0.25, 0.05)
 
         supp_struct_str = 'Jacket' if water_depth < 120 else 'Floating'
         axs[i].text(2, axs[i].get_ylim()[1] * 0.05, supp_struct_str, rotation=90)
@@ -275,24 +239,11 @@ def plot_ic_cost_vs_water_depth():
     port_distance = 50  # Assuming a constant port distance
     eh_capacity = 1000  # Assuming a constant energy hub capacity of 1GW
 
-    # Initialize lists to store the costs for ice cover 0 and 1
-    total_costs_ice0, equip_costs_ice0, inst_costs_ice0, total_ope_costs_ice0, deco_costs_ice0 = [], [], [], [], []
-    total_costs_ice1, equip_costs_ice1, inst_costs_ice1, total_ope_costs_ice1, deco_costs_ice1 = [], [], [], [], []
-
-    for wd in water_depths:
-        # Costs for ice_cover = 0
-        total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = eh_cost_lin(wd, 0, port_distance, eh_capacity)
-        total_costs_ice0.append(total_cost)
-        equip_costs_ice0.append(equip_cost)
-        inst_costs_ice0.append(inst_cost)
-        total_ope_costs_ice0.append(total_ope_cost)
-        deco_costs_ice0.append(deco_cost)
-        
-        # Costs for ice_cover = 1
-        total_cost, equip_cost, inst_cost, total_ope_cost, deco_cost = eh_cost_lin(wd, 1, port_distance, eh_capacity)
-        total_costs_ice1.append(total_cost)
-        equip_costs_ice1.append(equip_cost)
-        total_ope_costs_ice1.append(total_ope_cost)
+    # Costs for ice_cover = 0
+    total_costs_ice0, equip_costs_ice0, inst_costs_ice0, total_ope_costs_ice0, deco_costs_ice0 = eh_cost_lin(water_depths, 0, port_distance, eh_capacity)
+    
+    # Costs for ice_cover = 1
+    total_costs_ice1, equip_costs_ice1, _, total_ope_costs_ice1, _ = eh_cost_lin(water_depths, 1, port_distance, eh_capacity)
 
     fig, axs = plt.subplots(2, 1, figsize=(6, 6), gridspec_kw={'height_ratios': [4, 1]}, sharex=True)
     
@@ -310,8 +261,7 @@ def plot_ic_cost_vs_water_depth():
 
     axs[0].set_xlim(0, 300)
     axs[0].set_ylim(0, 125)
-    axs[0].yaxis.set_major_locator(MultipleLocator(25))
-    axs[0].yaxis.set_minor_locator(MultipleLocator(5))
+    set_ticks_and_grid(axs[0], 50, 5, 25, 5)
 
     # Plotting the smaller range for ice_cover = 0
     axs[1].plot(water_depths, total_costs_ice0, linestyle='-', color=line1.get_color())
@@ -326,16 +276,9 @@ def plot_ic_cost_vs_water_depth():
     axs[1].plot(water_depths, total_ope_costs_ice1, linestyle='--', color=line4.get_color())
 
     axs[1].set_ylim(0, 2)
-    axs[1].yaxis.set_major_locator(MultipleLocator(1))
-    axs[1].yaxis.set_minor_locator(MultipleLocator(0.25))
+    set_ticks_and_grid(axs[1], 50, 5, 1, 0.25)
 
     for ax in axs:
-        ax.xaxis.set_major_locator(MultipleLocator(50))
-        ax.xaxis.set_minor_locator(MultipleLocator(5))
-        ax.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-        ax.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-        ax.minorticks_on()
-        
         ax.axvline(x=120, color='grey', linewidth='1.5', linestyle='--')
         
     axs[0].text(4, plt.ylim()[1] * 0.05, 'Jacket', rotation=90, verticalalignment='bottom')
@@ -356,26 +299,11 @@ def plot_ic_equip_cost_vs_water_depth():
     water_depths = np.linspace(0, 300, 500)
     eh_capacity = 1000  # Assuming a constant energy hub capacity of 1GW
 
-    # Initialize lists to store the costs for ice cover 0 and 1
-    supp_costs_ice0, conv_costs_ice0, equip_costs_ice0 = [], [], []
-    supp_costs_ice1, conv_costs_ice1, equip_costs_ice1 = [], [], []
-
-    for wd in water_depths:
-        support_structure = check_supp(wd)
+    # Costs for ice_cover = 0
+    supp_costs_ice0, conv_costs_ice0, equip_costs_ice0 = eh_equip_cost_lin(water_depths, 0, eh_capacity)
 
-        # Costs for ice_cover = 0
-        supp_cost, conv_cost = equip_cost_lin(wd, support_structure, 0, eh_capacity)
-        equip_cost = supp_cost + conv_cost
-        supp_costs_ice0.append(supp_cost)
-        conv_costs_ice0.append(conv_cost)
-        equip_costs_ice0.append(equip_cost)
-
-        # Costs for ice_cover = 1
-        supp_cost, conv_cost = equip_cost_lin(wd, support_structure, 1, eh_capacity)
-        equip_cost = supp_cost + conv_cost
-        supp_costs_ice1.append(supp_cost)
-        conv_costs_ice1.append(conv_cost)
-        equip_costs_ice1.append(equip_cost)
+    # Costs for ice_cover = 1
+    supp_costs_ice1, conv_costs_ice1, equip_costs_ice1 = eh_equip_cost_lin(water_depths, 1, eh_capacity)
 
     plt.figure(figsize=(6, 5))
     
@@ -392,17 +320,8 @@ def plot_ic_equip_cost_vs_water_depth():
     plt.xlim(0, 300)
     plt.ylim(0, 100)
 
-    # Set the number of major ticks and minor ticks
-    x_major_locator = MultipleLocator(50)
-    x_minor_locator = MultipleLocator(5)
-    y_major_locator = MultipleLocator(25)
-    y_minor_locator = MultipleLocator(5)
-
-    # Apply the major and minor tick locators
-    plt.gca().xaxis.set_major_locator(x_major_locator)
-    plt.gca().xaxis.set_minor_locator(x_minor_locator)
-    plt.gca().yaxis.set_major_locator(y_major_locator)
-    plt.gca().yaxis.set_minor_locator(y_minor_locator)
+    # Set the major and minor ticks and grid lines
+    set_ticks_and_grid(plt.gca(), 50, 5, 25, 5)
 
     # Add vertical lines for support structure domains
     plt.axvline(x=120, color='grey', linewidth=1.5, linestyle='--')
@@ -411,10 +330,6 @@ def plot_ic_equip_cost_vs_water_depth():
     plt.text(4, plt.ylim()[1] * 0.05, 'Jacket', rotation=90, verticalalignment='bottom')
     plt.text(124, plt.ylim()[1] * 0.05, 'Floating', rotation=90, verticalalignment='bottom')
     
-    plt.grid(which='major', linestyle='-', linewidth='0.5', color='gray')
-    plt.grid(which='minor', linestyle=':', linewidth='0.5', color='gray')
-    plt.minorticks_on()
-    
     plt.xlabel('Water Depth (m)')
     plt.ylabel('Cost (M€)')
     
@@ -1,3 +1,26 @@
+import numpy as np
+
+# Coefficients for equipment cost calculation based on the support structure
+SUPPORT_STRUCTURE_COEFF = {
+    'jacket': (233, 47, 309, 62),
+    'floating': (87, 68, 116, 91)
+}
+
+# Coefficients for power converter cost calculation
+EQUIP_COEFF = (22.87, 7.06)
+
+# Installation coefficients of the vessels for each support structure, one row per vessel (PSIV for jacket, HLCV and AHV for floating)
+INST_COEFF = {
+    'jacket': np.array([(1, 18.5, 24, 96, 200)]),
+    'floating': np.array([(1, 22.5, 10, 0, 40), (3, 18.5, 30, 90, 40)])
+}
+
+# Decommissioning coefficients of the vessels for each support structure, one row per vessel (PSIV for jacket, HLCV and AHV for floating)
+DECO_COEFF = {
+    'jacket': np.array([(1, 18.5, 24, 96, 200)]),
+    'floating': np.array([(1, 22.5, 10, 0, 40), (3, 18.5, 30, 30, 40)])
+}
+
 def check_supp(water_depth):
         """
         Determines the support structure type based on water depth.
@@ -18,18 +41,10 @@ def equip_cost_lin(water_depth, support_structure, ice_cover, eh_capacity):
     Returns:
     - float: Calculated equipment cost.
     """
-    # Coefficients for equipment cost calculation based on the support structure and year
-    support_structure_coeff = {
-        'jacket': (233, 47, 309, 62),
-        'floating': (87, 68, 116, 91)
-    }
-
-    equip_coeff = (22.87, 7.06)
-    
     # Define parameters
-    c1, c2, c3, c4 = support_structure_coeff[support_structure]
+    c1, c2, c3, c4 = SUPPORT_STRUCTURE_COEFF[support_structure]
     
-    c5, c6 = equip_coeff
+    c5, c6 = EQUIP_COEFF
     
     # Define equivalent electrical power
     equiv_capacity = 0.5 * eh_capacity
@@ -51,42 +66,19 @@ def equip_cost_lin(water_depth, support_structure, ice_cover, eh_capacity):
 def inst_deco_cost_lin(supp_structure, port_distance, operation):
     """
     Calculate installation or decommissioning cost of offshore substations based on the water depth, and port distance.
+    The port distance can be given as an array, in which case the cost of each element is calculated at once.
 
     Returns:
-    - float: Calculated installation or decommissioning cost.
+    - float or numpy.ndarray: Calculated installation or decommissioning cost.
     """
-    # Installation coefficients for different vehicles
-    inst_coeff = {
-        ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-        ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-        ('floating','AHV'): (3, 18.5, 30, 90, 40)
-    }
-
-    # Decommissioning coefficients for different vehicles
-    deco_coeff = {
-        ('jacket' 'PSIV'): (1, 18.5, 24, 96, 200),
-        ('floating','HLCV'): (1, 22.5, 10, 0, 40),
-        ('floating','AHV'): (3, 18.5, 30, 30, 40)
-    }
-
-    # Choose the appropriate coefficients based on the operation type
-    coeff = inst_coeff if operation == 'inst' else deco_coeff
-        
-    if supp_structure == 'jacket':
-        c1, c2, c3, c4, c5 = coeff[('jacket' 'PSIV')]
-        # Calculate installation cost for jacket
-        total_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1e3) / 24
-    elif supp_structure == 'floating':
-        total_cost = 0
-        
-        # Iterate over the coefficients for floating (HLCV and AHV)
-        for vessel_type in [('floating', 'HLCV'), ('floating', 'AHV')]:
-            c1, c2, c3, c4, c5 = coeff[vessel_type]
-            # Calculate installation cost for the current vessel type
-            vessel_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1e3) / 24
-            # Add the cost for the current vessel type to the total cost
-            total_cost += vessel_cost
+    # Choose the appropriate coefficients based on the operation type, with a trailing axis for each axis of the port distance
+    coeff = (INST_COEFF if operation == 'inst' else DECO_COEFF)[supp_structure]
+    c1, c2, c3, c4, c5 = coeff.T[(...,) + (None,) * np.ndim(port_distance)]
+    
+    # Calculate installation cost for each vessel and add the cost of all vessels
+    vessel_cost = ((1 / c1) * ((2 * port_distance) / c2 + c3) + c4) * (c5 * 1e3) / 24
+    total_cost = vessel_cost.sum(axis=0)
     
     total_cost *= 1e-6
     
-    return total_cost
\ No newline at end of file
+    return total_cost if np.ndim(total_cost) else float(total_cost)
@@ -1,3 +1,14 @@
+# Discount rate
+DISCOUNT_RATE = 0.05
+
+# Number of years from the installation year to the start of operation, and from the installation year to decommissioning
+OPE_OFFSET = 5
+DEC_OFFSET = OPE_OFFSET + 25
+
+# Discount factors relative to the installation year, summed over the operational years and for the decommissioning year
+OPE_DISCOUNT = sum((1 + DISCOUNT_RATE) ** -year for year in range(OPE_OFFSET, DEC_OFFSET))
+DECO_DISCOUNT = (1 + DISCOUNT_RATE) ** -DEC_OFFSET
+
 def present_value(first_year, equip_cost, inst_cost, ope_cost_yearly, deco_cost):
     """
     Calculate the total present value of cable cost.
@@ -14,28 +25,14 @@ def present_value(first_year, equip_cost, inst_cost, ope_cost_yearly, deco_cost)
     first_year = int(first_year)
     current_year = 2024
     
-    # Define years for installation, operational, and decommissioning
+    # Discount factor of the installation year, all later years are discounted relative to it
     inst_year = (first_year - current_year)  # First year (installation year)
-    ope_year = inst_year + 5  # Operational costs start year
-    dec_year = ope_year + 25  # Decommissioning year
-    end_year = dec_year + 2  # End year
-
-    # Discount rate
-    discount_rate = 0.05
-
-    # Initialize total operational cost
-    total_ope_cost = 0
+    inst_discount = (1 + DISCOUNT_RATE) ** -inst_year
 
-    # Adjust cost for each year
-    for year in range(inst_year, end_year + 1):
-        discount_factor = (1 + discount_rate) ** -year  # Calculate the discount factor for the year
-        if year == inst_year:
-            equip_cost *= discount_factor  # Discount equipment cost for the installation year
-            inst_cost *= discount_factor  # Discount installation cost for the installation year
-        elif ope_year <= year < dec_year:
-            total_ope_cost += ope_cost_yearly * discount_factor  # Accumulate discounted operational cost for each year
-        elif year == dec_year:
-            deco_cost *= discount_factor  # Discount decommissioning cost for the decommissioning year
+    equip_cost = equip_cost * inst_discount  # Discount equipment cost for the installation year
+    inst_cost = inst_cost * inst_discount  # Discount installation cost for the installation year
+    total_ope_cost = ope_cost_yearly * (inst_discount * OPE_DISCOUNT)  # Accumulate discounted operational cost over the operational years
+    deco_cost = deco_cost * (inst_discount * DECO_DISCOUNT)  # Discount decommissioning cost for the decommissioning year
 
     # Calculate total present value of cost
     total_cost = equip_cost + inst_cost + total_ope_cost + deco_cost
@@ -55,33 +52,4 @@ def present_value_single(first_year, equip_cost, inst_cost, ope_cost_yearly, dec
         Returns:
             float: Total present value of cost.
         """
-        first_year = int(first_year)
-        current_year = 2024
-        
-        # Define years for installation, operational, and decommissioning
-        inst_year = (first_year - current_year) # First year (installation year)
-        ope_year = inst_year + 5  # Operational costs start year
-        dec_year = ope_year + 25  # Decommissioning year
-        end_year = dec_year + 2  # End year
-
-        # Discount rate
-        discount_rate = 0.05
-
-        # Initialize total operational cost
-        total_ope_cost = 0
-
-        # Adjust cost for each year
-        for year in range(inst_year, end_year + 1):
-            discount_factor = (1 + discount_rate) ** -year  # Calculate the discount factor for the year
-            if year == inst_year:
-                equip_cost *= discount_factor  # Discount equipment cost for the installation year
-                inst_cost *= discount_factor  # Discount installation cost for the installation year
-            elif ope_year <= year < dec_year:
-                total_ope_cost += ope_cost_yearly * discount_factor  # Accumulate discounted operational cost for each year
-            elif year == dec_year:
-                deco_cost *= discount_factor  # Discount decommissioning cost for the decommissioning year
-
-        # Calculate total present value of cost
-        total_cost = equip_cost + inst_cost + total_ope_cost + deco_cost
-
-        return total_cost
+        return present_value(first_year, equip_cost, inst_cost, ope_cost_yearly, deco_cost)[0]